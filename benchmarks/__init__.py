@@ -0,0 +1,5 @@
+"""Benchmarks for the overhead of request and response validation.
+
+Run with ``python -m benchmarks`` (or ``make bench``) from the repository
+root, see ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,141 @@
+"""Measure per-request validation overhead and compare it to a baseline.
+
+Every scenario sends the same request to an app whose views are marked
+``openapi=True`` and to one whose views are not, and reports the median
+time per request of both and their difference: the validation overhead.
+
+Results are written as JSON. Pass ``--baseline`` with a previous results
+file to exit with status 1 if any scenario got slower by more than
+``--threshold``.
+"""
+
+from .apps import SPEC_SIZES
+from .apps import make_app
+from .timing import Scenario
+from .timing import time_requests
+from dataclasses import asdict
+from importlib.metadata import version
+from pathlib import Path
+from webtest import TestApp
+
+import argparse
+import json
+import platform
+import sys
+import time
+import typing as t
+
+SCENARIOS = (
+    Scenario("list-1", "GET", "/todos", params={"limit": 1}),
+    Scenario("list-1000", "GET", "/todos", params={"limit": 1000}),
+    Scenario("create", "POST", "/todos", json={"title": "Buy milk"}),
+    Scenario("update", "PUT", "/todos/0", json={"title": "Buy milk"}),
+)
+
+
+def run(sizes: t.Iterable[str], number: int, repeat: int) -> dict[str, t.Any]:
+    """Run all scenarios against apps for the given spec sizes."""
+    results = {}
+    for size in sizes:
+        start = time.perf_counter()
+        apps = {True: TestApp(make_app(size, openapi=True))}
+        startup = (time.perf_counter() - start) * 1e3
+        apps[False] = TestApp(make_app(size, openapi=False))
+        print(f"{size:<20} startup {startup:.0f}ms", file=sys.stderr)  # noqa: T201
+        results[f"{size}/startup"] = {"spec": size, "startup_ms": round(startup)}
+
+        for scenario in SCENARIOS:
+            plain = time_requests(apps[False], scenario, number, repeat)
+            validated = time_requests(apps[True], scenario, number, repeat)
+            name = f"{size}/{scenario.name}"
+            results[name] = {
+                "spec": size,
+                "scenario": asdict(scenario),
+                "plain_us": round(plain, 1),
+                "validated_us": round(validated, 1),
+                "overhead_us": round(validated - plain, 1),
+            }
+            print(  # noqa: T201
+                f"{name:<20} plain {plain:9.1f}µs  validated {validated:9.1f}µs  "
+                f"overhead {validated - plain:9.1f}µs",
+                file=sys.stderr,
+            )
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "openapi-core": version("openapi-core"),
+            "pyramid": version("pyramid"),
+            "number": number,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: dict[str, t.Any], baseline: dict[str, t.Any], threshold: float
+) -> list[str]:
+    """Return descriptions of scenarios slower than baseline by > `threshold`."""
+    regressions = []
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        key, unit = (
+            ("startup_ms", "ms") if "startup_ms" in result else ("validated_us", "µs")
+        )
+        ratio = result[key] / before[key]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {before[key]}{unit} -> {result[key]}{unit} ({ratio - 1:+.0%})"
+            )
+    return regressions
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    """Console entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--size",
+        action="append",
+        choices=SPEC_SIZES,
+        help="spec size to benchmark, may be repeated (default: all)",
+    )
+    parser.add_argument("--number", type=int, default=200, help="requests per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario")
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write results to this file (default: stdout)"
+    )
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown against the baseline (default: 0.1, i.e. 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.size or SPEC_SIZES, args.number, args.repeat)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)  # noqa: T201
+
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.threshold
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)  # noqa: T201
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""In-process apps serving the todoapp API, with and without validation."""
+
+from pathlib import Path
+from pyramid.config import Configurator
+from pyramid.request import Request
+from pyramid.router import Router
+
+import copy
+import json
+import tempfile
+import typing as t
+import yaml
+
+TODOAPP_SPEC = Path(__file__).parent.parent / "examples" / "todoapp" / "openapi.yaml"
+
+# Number of paths, on top of the todoapp's, in each spec size
+SPEC_SIZES = {"small": 0, "medium": 100, "huge": 2000}
+
+
+def _items(limit: int) -> list[dict[str, str]]:
+    return [{"title": f"Buy milk #{i}"} for i in range(limit)]
+
+
+def list_todos(request: Request) -> list[dict[str, str]]:
+    """Return `limit` TODO items, from validated parameters."""
+    return _items(request.openapi_validated.parameters.query.get("limit", 3))
+
+
+def create_todo(request: Request) -> str:
+    """Accept a validated TODO item."""
+    return f"Added {request.openapi_validated.body['title']}."
+
+
+def update_todo(request: Request) -> str:
+    """Accept a validated TODO item for an index."""
+    todo_id = request.openapi_validated.parameters.path["todo_id"]
+    return f"Updated {todo_id} to {request.openapi_validated.body['title']}."
+
+
+def list_todos_plain(request: Request) -> list[dict[str, str]]:
+    """Return `limit` TODO items, without validation."""
+    return _items(int(request.GET.get("limit", 3)))
+
+
+def create_todo_plain(request: Request) -> str:
+    """Accept a TODO item without validation."""
+    return f"Added {request.json_body['title']}."
+
+
+def update_todo_plain(request: Request) -> str:
+    """Accept a TODO item for an index without validation."""
+    todo_id = int(request.matchdict["todo_id"])  # ty: ignore[not-subscriptable]
+    return f"Updated {todo_id} to {request.json_body['title']}."
+
+
+def todoapp_spec(extra_paths: int = 0) -> dict[str, t.Any]:
+    """Return the todoapp spec, padded with `extra_paths` similar paths."""
+    spec = yaml.safe_load(TODOAPP_SPEC.read_text())
+    template = spec["paths"]["/todos/{todo_id}"]
+    for i in range(extra_paths):
+        path = copy.deepcopy(template)
+        for operation in path.values():
+            operation["operationId"] = f"{operation['operationId']}{i}"
+        spec["paths"][f"/todos{i}/{{todo_id}}"] = path
+    return spec
+
+
+def make_app(size: str, openapi: bool) -> Router:
+    """Create an app for a spec size, with validated or plain views."""
+    spec = todoapp_spec(SPEC_SIZES[size])
+    views = (
+        (list_todos, create_todo, update_todo)
+        if openapi
+        else (list_todos_plain, create_todo_plain, update_todo_plain)
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as document:
+        json.dump(spec, document)
+        document.flush()
+
+        with Configurator() as config:
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(document.name)
+            for route_name, path in enumerate(spec["paths"]):
+                config.add_route(str(route_name), path)
+                if path == "/todos":
+                    config.add_view(
+                        views[0],
+                        route_name=str(route_name),
+                        request_method="GET",
+                        renderer="json",
+                        openapi=openapi,
+                    )
+                    config.add_view(
+                        views[1],
+                        route_name=str(route_name),
+                        request_method="POST",
+                        renderer="json",
+                        openapi=openapi,
+                    )
+                else:
+                    config.add_view(
+                        views[2],
+                        route_name=str(route_name),
+                        request_method="PUT",
+                        renderer="json",
+                        openapi=openapi,
+                    )
+            return config.make_wsgi_app()
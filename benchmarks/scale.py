@@ -0,0 +1,129 @@
+"""Measure startup and per-request validation time as functions of spec size.
+
+For every ``--paths`` count, generates a spec with ``benchmarks.specgen``
+and reports, as JSON, the time to load and validate the spec and add the
+routes (``config_ms``), to create the app including ``check_all_routes``
+(``app_created_ms``), to match the route of the last path (``route_us``)
+and to serve validated GET and PUT requests. With ``--radix-dispatch``,
+routes are matched by a ``RadixRoutesMapper``.
+
+Run with ``python -m benchmarks.scale --paths 100 --paths 1000``.
+"""
+
+from .specgen import SpecParams
+from .specgen import add_routes
+from .specgen import example
+from .specgen import write
+from .timing import Scenario
+from .timing import time_requests
+from .timing import time_routing
+from dataclasses import asdict
+from pathlib import Path
+from pyramid.config import Configurator
+from pyramid_openapi3.dispatch import install_radix_mapper
+from webtest import TestApp
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import typing as t
+
+
+def measure(
+    params: SpecParams, number: int, repeat: int, *, radix_dispatch: bool = False
+) -> dict[str, t.Any]:
+    """Build an app for a generated spec and time it."""
+    with tempfile.TemporaryDirectory() as directory:
+        spec = write(params, Path(directory))
+
+        start = time.perf_counter()
+        config = Configurator()
+        config.include("pyramid_openapi3")
+        if radix_dispatch:
+            install_radix_mapper(config)
+        if params.files == 1:
+            config.pyramid_openapi3_spec(str(spec))
+        else:
+            config.pyramid_openapi3_spec_directory(str(spec))
+        add_routes(config, params)
+        config.commit()
+        configured = time.perf_counter()
+        app = TestApp(config.make_wsgi_app())
+        created = time.perf_counter()
+
+        # the last path is the worst case for openapi-core's path finder
+        path = f"/r{params.paths - 1}/1"
+        component = (params.paths - 1) % params.components
+        get = Scenario("get", "GET", path)
+        put = Scenario("put", "PUT", path, json=example(params, component))
+        return {
+            "params": asdict(params),
+            "radix_dispatch": radix_dispatch,
+            "config_ms": round((configured - start) * 1e3),
+            "app_created_ms": round((created - configured) * 1e3),
+            "route_us": round(time_routing(app.app, path, number, repeat), 1),
+            "get_us": round(time_requests(app, get, number, repeat), 1),
+            "put_us": round(time_requests(app, put, number, repeat), 1),
+        }
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    """Console entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scale",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--paths",
+        type=int,
+        action="append",
+        help="number of paths, may be repeated (default: 10, 100 and 1000)",
+    )
+    parser.add_argument("--depth", type=int, default=3, help="length of $ref chains")
+    parser.add_argument("--components", type=int, default=10, help="$ref chains")
+    parser.add_argument("--one-of", type=int, default=2, help="width of oneOf unions")
+    parser.add_argument("--files", type=int, default=1, help="files to split paths in")
+    parser.add_argument("--number", type=int, default=100, help="requests per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per request")
+    parser.add_argument(
+        "--radix-dispatch",
+        action="store_true",
+        help="match routes with a RadixRoutesMapper",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="default: stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for paths in args.paths or (10, 100, 1000):
+        params = SpecParams(
+            paths=paths,
+            depth=args.depth,
+            components=args.components,
+            one_of=args.one_of,
+            files=args.files,
+        )
+        result = measure(
+            params, args.number, args.repeat, radix_dispatch=args.radix_dispatch
+        )
+        results.append(result)
+        print(  # noqa: T201
+            f"{paths:>6} paths  config {result['config_ms']:6}ms  "
+            f"app created {result['app_created_ms']:6}ms  "
+            f"route {result['route_us']:6.1f}µs  "
+            f"GET {result['get_us']:8.1f}µs  PUT {result['put_us']:8.1f}µs",
+            file=sys.stderr,
+        )
+
+    output = json.dumps({"results": results}, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""Generate large, deterministic OpenAPI specs with matching routes and views.
+
+The generated API has `paths` paths ``/r{i}/{item_id}``, each with a GET
+returning a `one_of` wide ``oneOf`` union of schemas, and a PUT accepting
+one of these schemas. Every schema is the head of a `depth` long chain of
+``$ref``-ed nested objects, and there are `components` such chains. With
+`files` > 1 the spec is split like ``examples/splitfile/spec``: a root
+document, schemas in ``schemas.yaml`` and paths fanned out over `files`
+``paths/*.yaml`` documents.
+"""
+
+from dataclasses import dataclass
+from dataclasses import fields
+from pathlib import Path
+from pyramid.config import Configurator
+from pyramid.request import Request
+
+import argparse
+import typing as t
+import yaml
+
+
+@dataclass(frozen=True)
+class SpecParams:
+    """Shape of a generated spec."""
+
+    paths: int = 100
+    depth: int = 3
+    components: int = 10
+    one_of: int = 2
+    files: int = 1
+
+    def __post_init__(self) -> None:
+        """Check parameters are in range."""
+        if min(self.paths, self.depth, self.components, self.one_of, self.files) < 1:
+            raise ValueError(f"All parameters must be positive: {self}")
+        if self.one_of > self.components:
+            raise ValueError("one_of can't be larger than components")
+
+
+def _schema(component: int, level: int, depth: int, ref_prefix: str) -> dict:
+    schema: dict[str, t.Any] = {
+        "type": "object",
+        "required": ["id", "name"],
+        "properties": {
+            "id": {"type": "integer", "minimum": 0},
+            "name": {"type": "string", "maxLength": 64},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+    }
+    if level == 0:
+        schema["required"].append("kind")
+        schema["properties"]["kind"] = {"const": f"c{component}"}
+    if level < depth - 1:
+        schema["properties"]["child"] = {
+            "$ref": f"{ref_prefix}C{component}_{level + 1}"
+        }
+    return schema
+
+
+def schemas(params: SpecParams, ref_prefix: str = "#/components/schemas/") -> dict:
+    """Return all component schemas, keyed by name."""
+    result = {}
+    for c in range(params.components):
+        for level in range(params.depth):
+            result[f"C{c}_{level}"] = _schema(c, level, params.depth, ref_prefix)
+        result[f"U{c}"] = {
+            "oneOf": [
+                {"$ref": f"{ref_prefix}C{(c + k) % params.components}_0"}
+                for k in range(params.one_of)
+            ]
+        }
+    return result
+
+
+def path_item(params: SpecParams, i: int, ref_prefix: str) -> dict:
+    """Return the path item for ``/r{i}/{item_id}``."""
+    c = i % params.components
+    return {
+        "parameters": [
+            {
+                "name": "item_id",
+                "in": "path",
+                "required": True,
+                "schema": {"type": "integer", "minimum": 0},
+            }
+        ],
+        "get": {
+            "operationId": f"r{i}.get",
+            "responses": {
+                "200": {
+                    "description": "An item",
+                    "content": {
+                        "application/json": {"schema": {"$ref": f"{ref_prefix}U{c}"}}
+                    },
+                },
+            },
+        },
+        "put": {
+            "operationId": f"r{i}.put",
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {"schema": {"$ref": f"{ref_prefix}C{c}_0"}}
+                },
+            },
+            "responses": {
+                "200": {
+                    "description": "Updated",
+                    "content": {"application/json": {"schema": {"type": "string"}}},
+                },
+            },
+        },
+    }
+
+
+def generate(params: SpecParams) -> dict[str, dict]:
+    """Return the documents of the spec, keyed by path relative to the root.
+
+    The root document is always ``openapi.yaml``.
+    """
+    root: dict[str, t.Any] = {
+        "openapi": "3.1.0",
+        "info": {"version": "1.0.0", "title": "Generated API"},
+        "paths": {},
+        "components": {"schemas": {}},
+    }
+    if params.files == 1:
+        root["paths"] = {
+            f"/r{i}/{{item_id}}": path_item(params, i, "#/components/schemas/")
+            for i in range(params.paths)
+        }
+        root["components"]["schemas"] = schemas(params)
+        return {"openapi.yaml": root}
+
+    documents: dict[str, dict] = {"openapi.yaml": root}
+    documents["schemas.yaml"] = schemas(params, ref_prefix="#/")
+    root["components"]["schemas"] = {
+        name: {"$ref": f"schemas.yaml#/{name}"} for name in documents["schemas.yaml"]
+    }
+    for i in range(params.paths):
+        filename = f"paths/{i % params.files}.yaml"
+        documents.setdefault(filename, {})[f"r{i}"] = path_item(
+            params, i, "../schemas.yaml#/"
+        )
+        root["paths"][f"/r{i}/{{item_id}}"] = {"$ref": f"{filename}#/r{i}"}
+    return documents
+
+
+def write(params: SpecParams, directory: Path) -> Path:
+    """Write the spec into `directory` and return the root document's path."""
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    for filename, document in generate(params).items():
+        path = directory / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(yaml.dump(document, Dumper=dumper, sort_keys=False))
+    return directory / "openapi.yaml"
+
+
+def example(params: SpecParams, component: int, level: int = 0) -> dict:
+    """Return an instance valid against schema ``C{component}_{level}``."""
+    instance: dict[str, t.Any] = {"id": level, "name": f"c{component} level {level}"}
+    if level == 0:
+        instance["kind"] = f"c{component}"
+    if level < params.depth - 1:
+        instance["child"] = example(params, component, level + 1)
+    return instance
+
+
+def add_routes(
+    config: Configurator, params: SpecParams, *, openapi: bool = True
+) -> None:
+    """Add a route and GET and PUT views for every generated path."""
+
+    def get(request: Request) -> dict:
+        return example(params, int(request.matched_route.name[1:]) % params.components)
+
+    def put(request: Request) -> str:
+        return "Updated."
+
+    for i in range(params.paths):
+        config.add_route(f"r{i}", f"/r{i}/{{item_id}}")
+        config.add_view(
+            get,
+            route_name=f"r{i}",
+            request_method="GET",
+            renderer="json",
+            openapi=openapi,
+        )
+        config.add_view(
+            put,
+            route_name=f"r{i}",
+            request_method="PUT",
+            renderer="json",
+            openapi=openapi,
+        )
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    """Console entry point, writing a generated spec to a directory."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.specgen")
+    parser.add_argument("directory", type=Path)
+    for field in fields(SpecParams):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}", type=int, default=field.default
+        )
+    args = parser.parse_args(argv)
+    params = SpecParams(
+        **{field.name: getattr(args, field.name) for field in fields(SpecParams)}
+    )
+    print(write(params, args.directory))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Time requests sent to in-process apps."""
+
+from dataclasses import dataclass
+from pyramid.interfaces import IRoutesMapper
+from pyramid.request import Request
+from pyramid.router import Router
+from webtest import TestApp
+
+import statistics
+import time
+import typing as t
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A request sent to the benchmarked apps."""
+
+    name: str
+    method: str
+    path: str
+    params: dict[str, t.Any] | None = None
+    json: t.Any = None
+
+
+def time_requests(app: TestApp, scenario: Scenario, number: int, repeat: int) -> float:
+    """Return the median over `repeat` runs of the time per request in µs."""
+    if scenario.json is not None:
+        method = getattr(app, f"{scenario.method.lower()}_json")
+        args: dict[str, t.Any] = {"params": scenario.json}
+    else:
+        method = getattr(app, scenario.method.lower())
+        args = {"params": scenario.params}
+
+    method(scenario.path, status=200, **args)  # warm up, and check it works
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            method(scenario.path, **args)
+        runs.append((time.perf_counter() - start) / number * 1e6)
+    return statistics.median(runs)
+
+
+def time_routing(app: Router, path: str, number: int, repeat: int) -> float:
+    """Return the median over `repeat` runs of the time to match `path` in µs."""
+    mapper = app.registry.getUtility(IRoutesMapper)
+    request = Request.blank(path)
+    assert mapper(request)["route"] is not None  # noqa: S101
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            mapper(request)
+        runs.append((time.perf_counter() - start) / number * 1e6)
+    return statistics.median(runs)
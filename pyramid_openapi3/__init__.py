@@ -1,20 +1,41 @@
 """Configure pyramid_openapi3 addon."""
 
+from .assets import ExplorerPage
+from .assets import StaticDocument
+from .codec import JSON_MEDIA_TYPES
+from .codec import STDLIB
+from .codec import get_json_codec
+from .compiler import load_compiled
+from .dispatch import install_radix_mapper
+from .early import EarlyRequestValidation
 from .exceptions import MissingEndpointsError
 from .exceptions import RequestValidationError
 from .exceptions import ResponseValidationError
 from .exceptions import extract_errors
+from .exceptions import get_extracted_errors
+from .index import OperationIndex
+from .index import PrefixTrie
+from .instrumentation import observe
+from .loaders import read_spec
+from .metrics import MetricsRegistry
+from .metrics import get_metrics
+from .policy import ValidationPolicy
+from .policy import get_api_settings
+from .renderers import OpenAPIJSON
+from .validation_cache import validate_spec
+from .validators import V30RequestUnmarshaller
+from .validators import V30ResponseHeadersValidator
+from .validators import V30ResponseValidator
+from .validators import V31RequestUnmarshaller
+from .validators import V31ResponseHeadersValidator
+from .validators import V31ResponseValidator
+from .validators import V32RequestUnmarshaller
+from .validators import V32ResponseHeadersValidator
+from .validators import V32ResponseValidator
+from .wrappers import UNPARSED
 from .wrappers import PyramidOpenAPIRequest
 from jsonschema_path import SchemaPath
-from openapi_core import V30ResponseValidator
-from openapi_core import V31ResponseValidator
-from openapi_core import V32ResponseValidator
-from openapi_core.unmarshalling.request import V30RequestUnmarshaller
-from openapi_core.unmarshalling.request import V31RequestUnmarshaller
-from openapi_core.unmarshalling.request import V32RequestUnmarshaller
 from openapi_core.validation.request.exceptions import SecurityValidationError
-from openapi_spec_validator import validate
-from openapi_spec_validator.readers import read_from_filename
 from openapi_spec_validator.versions.shortcuts import get_spec_version
 from pathlib import Path
 from pathlib import PurePosixPath
@@ -23,6 +44,7 @@ from pyramid.config import PHASE1_CONFIG
 from pyramid.config import Configurator
 from pyramid.config.views import ViewDeriverInfo
 from pyramid.events import ApplicationCreated
+from pyramid.events import BeforeTraversal
 from pyramid.exceptions import ConfigurationError
 from pyramid.httpexceptions import exception_response
 from pyramid.path import AssetResolver
@@ -32,11 +54,9 @@ from pyramid.response import Response
 from pyramid.security import NO_PERMISSION_REQUIRED
 from pyramid.settings import asbool
 from pyramid.tweens import EXCVIEW
-from string import Template
 from urllib.parse import urlparse
 
 import hupper
-import json
 import logging
 import typing as t
 
@@ -45,17 +65,30 @@ logger = logging.getLogger(__name__)
 
 def includeme(config: Configurator) -> None:
     """Pyramid knob."""
+    config.add_request_method(openapi_request, name="openapi_request", reify=True)
     config.add_request_method(openapi_validated, name="openapi_validated", reify=True)
+    config.add_request_method(openapi_json_body, name="openapi_json_body", reify=True)
     config.add_view_deriver(openapi_view)
+    config.add_renderer(
+        "openapi_json",
+        OpenAPIJSON(serializer=get_json_codec(config.registry.settings).dumps),
+    )
     config.add_directive("pyramid_openapi3_add_formatter", add_formatter)
     config.add_directive("pyramid_openapi3_add_deserializer", add_deserializer)
     config.add_directive("pyramid_openapi3_add_unmarshaller", add_unmarshaller)
     config.add_directive("pyramid_openapi3_add_explorer", add_explorer_view)
+    config.add_directive("pyramid_openapi3_add_metrics_view", add_metrics_view)
     config.add_directive("pyramid_openapi3_spec", add_spec_view)
     config.add_directive("pyramid_openapi3_spec_directory", add_spec_view_directory)
     config.add_directive("pyramid_openapi3_register_routes", register_routes)
     config.add_tween("pyramid_openapi3.tween.response_tween_factory", over=EXCVIEW)
     config.add_subscriber(check_all_routes, ApplicationCreated)
+    if asbool(
+        config.registry.settings.get("pyramid_openapi3.early_request_validation")
+    ):
+        early_validation = EarlyRequestValidation(config.registry.settings)
+        config.add_subscriber(early_validation.collect_routes, ApplicationCreated)
+        config.add_subscriber(early_validation, BeforeTraversal)
 
     if not config.registry.settings.get(  # pragma: no branch
         "pyramid_openapi3_extract_errors"
@@ -71,6 +104,11 @@ def includeme(config: Configurator) -> None:
     )
 
 
+def openapi_request(request: Request) -> PyramidOpenAPIRequest:
+    """Get the request adapter shared by request and response validation."""
+    return PyramidOpenAPIRequest(request)
+
+
 def openapi_validated(request: Request) -> dict:
     """Get validated parameters."""
     # We need this here in case someone calls request.openapi_validated on
@@ -80,18 +118,41 @@ def openapi_validated(request: Request) -> dict:
             "Cannot do openapi request validation on a view marked with openapi=False"
         )
 
-    gsettings = settings = request.registry.settings["pyramid_openapi3"]
-    route_settings = gsettings.get("routes")
-    if route_settings and request.matched_route.name in route_settings:
-        settings = request.registry.settings[route_settings[request.matched_route.name]]
-
     if request.environ.get("pyramid_openapi3.validate_request"):
-        openapi_request = PyramidOpenAPIRequest(request)
-        return settings["request_validator"].unmarshal(openapi_request)
+        validator = get_api_settings(request)["request_validator"]
+        if not request.environ.get("pyramid_openapi3.observed"):
+            return _unmarshal_request(request, validator)
+
+        with observe(request, "request") as observation:
+            result = _unmarshal_request(request, validator)
+            observation.record(result.errors, request.content_length)
+        return result
 
     return {}  # pragma: no cover
 
 
+def openapi_json_body(request: Request) -> t.Any:
+    """Get the JSON request body, reusing the one parsed by request validation.
+
+    Falls back to parsing `request.json_body` when validation did not
+    deserialize the body, e.g. on views with request validation disabled.
+    """
+    json_body = request.openapi_request.json_body
+    if json_body is UNPARSED:
+        return request.json_body
+    return json_body
+
+
+def _unmarshal_request(request: Request, validator: t.Any) -> t.Any:
+    timings = request.environ.get("pyramid_openapi3.timings")
+    if timings is None:
+        return validator.unmarshal(request.openapi_request)
+    with timings.phase("adapter"):
+        openapi_request = request.openapi_request
+    with timings.activate():
+        return validator.unmarshal(openapi_request)
+
+
 Context = t.TypeVar("Context")
 View = t.Callable[[Context, Request], Response]
 
@@ -107,26 +168,11 @@ def openapi_view(view: View, info: ViewDeriverInfo) -> View:
     response is validated against the openapi spec.
     """
     if info.options.get("openapi"):
+        # Settings are resolved once, here, rather than on every request
+        policy = ValidationPolicy.from_settings(info.settings)
 
         def wrapper_view(context: Context, request: Request) -> Response:
-            # We need this to be able to raise AttributeError if view code
-            # accesses request.openapi_validated on a view that is marked
-            # with openapi=False
-            request.environ["pyramid_openapi3.enabled"] = True
-
-            # If view is marked with openapi=True (i.e. we are in this
-            # function) and registry settings are not set to disable
-            # validation, then do request/response validation
-            request.environ["pyramid_openapi3.validate_request"] = asbool(
-                request.registry.settings.get(
-                    "pyramid_openapi3.enable_request_validation", True
-                )
-            )
-            request.environ["pyramid_openapi3.validate_response"] = asbool(
-                request.registry.settings.get(
-                    "pyramid_openapi3.enable_response_validation", True
-                )
-            )
+            policy.apply(request)
 
             # Request validation can happen already here, but response validation
             # needs to happen later in a tween
@@ -185,6 +231,15 @@ def add_explorer_view(
         resolved_template = asset_resolver.resolve(template)
         redirect_html = asset_resolver.resolve(oauth_redirect_html)
 
+        if hupper.is_active():  # pragma: no cover
+            hupper.get_reloader().watch_files([resolved_template.abspath()])
+        page = ExplorerPage(
+            Path(resolved_template.abspath()).read_text(),
+            ui_version=ui_version,
+            ui_config=ui_config,
+            oauth_config=oauth_config,
+        )
+
         def explorer_view(request: Request) -> Response:
             settings = config.registry.settings
             if settings.get(apiname) is None:
@@ -192,29 +247,11 @@ def add_explorer_view(
                     "You need to call config.pyramid_openapi3_spec for the explorer "
                     "to work."
                 )
-            with Path(resolved_template.abspath()).open() as f:
-                template = Template(f.read())
-                merged_ui_config = {
-                    "url": request.route_path(settings[apiname]["spec_route_name"]),
-                    "dom_id": "#swagger-ui",
-                    "deepLinking": True,
-                    "validatorUrl": None,
-                    "layout": "StandaloneLayout",
-                    "oauth2RedirectUrl": request.route_url(oauth_redirect_route_name),
-                }
-                if ui_config:
-                    merged_ui_config.update(ui_config)
-                # Check if request has a CSP nonce (for Content Security Policy)
-                nonce = getattr(request, "csp_nonce", None)
-                nonce_attr = f' nonce="{nonce}"' if nonce else ""
-
-                html = template.safe_substitute(
-                    ui_version=ui_version,
-                    ui_config=json.dumps(merged_ui_config),
-                    oauth_config=json.dumps(oauth_config),
-                    nonce_attr=nonce_attr,
-                )
-            return Response(html)
+            return page(
+                request,
+                spec_url=request.route_path(settings[apiname]["spec_route_name"]),
+                oauth_redirect_url=request.route_url(oauth_redirect_route_name),
+            )
 
         config.add_route(route_name, route)
         config.add_view(
@@ -234,6 +271,41 @@ def add_explorer_view(
     config.action((f"{apiname}_add_explorer",), register, order=PHASE0_CONFIG)
 
 
+def add_metrics_view(
+    config: Configurator,
+    route: str = "/metrics",
+    route_name: str = "pyramid_openapi3.metrics",
+    permission: str = NO_PERMISSION_REQUIRED,
+) -> None:
+    """Serve validation metrics in the Prometheus text format at `route`.
+
+    Enables `pyramid_openapi3.metrics`, if not already enabled.
+
+    :param route: URL path where to serve
+    :param route_name: Route name that's being added
+    :param permission: Permission for the metrics view
+    """
+    settings = config.registry.settings
+    metrics = get_metrics(settings)
+    if metrics is None:
+        metrics = settings["pyramid_openapi3_metrics"] = MetricsRegistry()
+    if not isinstance(metrics, MetricsRegistry):
+        raise ConfigurationError(
+            "The metrics view can only render the built-in MetricsRegistry, "
+            f"got {metrics!r}"
+        )
+
+    def metrics_view(request: Request) -> Response:
+        return Response(
+            metrics.render(),
+            content_type="text/plain; version=0.0.4",
+            charset="utf-8",
+        )
+
+    config.add_route(route_name, route)
+    config.add_view(route_name=route_name, permission=permission, view=metrics_view)
+
+
 def add_formatter(config: Configurator, name: str, func: t.Callable) -> None:
     """Add support for configuring formatters."""
     config.registry.settings.setdefault("pyramid_openapi3_formatters", {})
@@ -262,9 +334,14 @@ def add_spec_view(
     route_name: str = "pyramid_openapi3.spec",
     permission: str = NO_PERMISSION_REQUIRED,
     apiname: str = "pyramid_openapi3",
+    *,
+    compiled: str | None = None,
 ) -> None:
     """Serve and register OpenApi 3.0 specification file.
 
+    Both documents are kept in memory and served with an ETag, honouring
+    If-None-Match and Accept-Encoding (gzip, and brotli when installed).
+
     Also serves the specification as JSON, at ``route`` with its extension
     replaced by ``.json`` (e.g. ``/openapi.yaml`` -> ``/openapi.json``), under
     ``route_name`` suffixed with ``_json``. Not available on
@@ -274,6 +351,9 @@ def add_spec_view(
     :param route: URL path where to serve specification file
     :param route_name: Route name under which specification file will be served
     :param permission: Permission for the spec view
+    :param compiled:
+        Path to an artifact created by ``pyramid-openapi3-compile``. If it is
+        up to date, the spec is loaded from it without parsing or validation.
     """
 
     def register() -> None:
@@ -286,17 +366,26 @@ def add_spec_view(
 
         if hupper.is_active():  # pragma: no cover
             hupper.get_reloader().watch_files([filepath])
-        spec_dict, _ = read_from_filename(filepath)
-
-        validate(spec_dict)
+        document = Path(filepath).read_bytes()
+        spec_dict = _load_spec(config, filepath, compiled, content=document)
         spec = SchemaPath.from_dict(spec_dict)
-        spec_json = json.dumps(spec_dict)
-
-        def spec_view(request: Request) -> FileResponse:
-            return FileResponse(filepath, request=request, content_type="text/yaml")
+        spec_json = get_json_codec(config.registry.settings).encode(spec_dict)
 
-        def spec_view_json(request: Request) -> Response:
-            return Response(spec_json, content_type="application/json", charset="UTF-8")
+        cache_control = config.registry.settings.get(
+            "pyramid_openapi3.spec_cache_control"
+        )
+        spec_view = StaticDocument(
+            document,
+            content_type="text/yaml",
+            charset="UTF-8",
+            cache_control=cache_control,
+        )
+        spec_view_json = StaticDocument(
+            spec_json,
+            content_type="application/json",
+            charset="UTF-8",
+            cache_control=cache_control,
+        )
 
         config.add_route(route_name, route)
         config.add_view(route_name=route_name, permission=permission, view=spec_view)
@@ -311,7 +400,7 @@ def add_spec_view(
         )
 
         config.registry.settings[apiname] = _create_api_settings(
-            config, filepath, route_name, spec
+            config, filepath, route_name, spec, apiname
         )
         config.registry.settings.setdefault("pyramid_openapi3_apinames", []).append(
             apiname
@@ -327,12 +416,15 @@ def add_spec_view_directory(
     route_name: str = "pyramid_openapi3.spec",
     permission: str = NO_PERMISSION_REQUIRED,
     apiname: str = "pyramid_openapi3",
+    *,
+    compiled: str | None = None,
 ) -> None:
     """Serve and register OpenApi 3.0 specification directory.
 
     :param filepath: absolute/relative path to the root specification file
     :param route: URL path where to serve specification file
     :param route_name: Route name under which specification file will be served
+    :param compiled: Path to an artifact created by ``pyramid-openapi3-compile``
     """
 
     def register() -> None:
@@ -351,16 +443,15 @@ def add_spec_view_directory(
         if hupper.is_active():  # pragma: no cover
             hupper.get_reloader().watch_files(list(path.parent.iterdir()))
 
-        spec_dict, _ = read_from_filename(str(path))
         spec_url = path.as_uri()
-        validate(spec_dict, base_uri=spec_url)
+        spec_dict = _load_spec(config, path, compiled, base_uri=spec_url)
         spec = SchemaPath.from_dict(spec_dict, base_uri=spec_url)
 
         config.add_static_view(route, str(path.parent), permission=permission)
         config.add_route(route_name, f"{route}/{path.name}")
 
         config.registry.settings[apiname] = _create_api_settings(
-            config, filepath, route_name, spec
+            config, filepath, route_name, spec, apiname
         )
         config.registry.settings.setdefault("pyramid_openapi3_apinames", []).append(
             apiname
@@ -369,13 +460,51 @@ def add_spec_view_directory(
     config.action((f"{apiname}_spec",), register, order=PHASE0_CONFIG)
 
 
+def _load_spec(
+    config: Configurator,
+    filepath: str | Path,
+    compiled: str | None,
+    base_uri: str = "",
+    content: bytes | None = None,
+) -> t.Mapping[str, t.Any]:
+    """Read and validate the spec, unless an up to date artifact is given.
+
+    Pass the `content` of the spec file if it was already read.
+    """
+    if compiled is not None:
+        spec_dict = load_compiled(compiled, filepath)
+        if spec_dict is not None:
+            return spec_dict
+
+    spec_dict = read_spec(filepath, content)
+    validate_spec(
+        spec_dict,
+        filepath,
+        cache_dir=config.registry.settings.get(
+            "pyramid_openapi3.spec_validation_cache"
+        ),
+        base_uri=base_uri,
+    )
+    return spec_dict
+
+
 def _create_api_settings(
-    config: Configurator, filepath: str, route_name: str, spec: SchemaPath
+    config: Configurator,
+    filepath: str,
+    route_name: str,
+    spec: SchemaPath,
+    apiname: str,
 ) -> dict:
     custom_formatters = config.registry.settings.get("pyramid_openapi3_formatters")
     custom_deserializers = config.registry.settings.get(
         "pyramid_openapi3_deserializers"
     )
+    codec = get_json_codec(config.registry.settings)
+    if codec is not STDLIB:
+        custom_deserializers = {
+            **dict.fromkeys(JSON_MEDIA_TYPES, codec.deserialize),
+            **(custom_deserializers or {}),
+        }
     custom_unmarshallers = config.registry.settings.get(
         "pyramid_openapi3_unmarshallers"
     )
@@ -392,23 +521,48 @@ def _create_api_settings(
         "OpenAPIV3.1": V31ResponseValidator,
         "OpenAPIV3.2": V32ResponseValidator,
     }
+    response_headers_validators = {
+        "OpenAPIV3.0": V30ResponseHeadersValidator,
+        "OpenAPIV3.1": V31ResponseHeadersValidator,
+        "OpenAPIV3.2": V32ResponseHeadersValidator,
+    }
     request_unmarshaller = request_unmarshallers[str(spec_version)]
     response_validator = response_validators[str(spec_version)]
+    response_headers_validator = response_headers_validators[str(spec_version)]
+
+    # Filled in by `check_all_routes` once all routes are known
+    operation_index = OperationIndex(spec)
 
     return {
+        "apiname": apiname,
         "filepath": filepath,
         "spec_route_name": route_name,
         "spec": spec,
+        "operation_index": operation_index,
         "request_validator": request_unmarshaller(
             spec,
             extra_format_validators=custom_formatters,
             extra_media_type_deserializers=custom_deserializers,
             extra_format_unmarshallers=custom_unmarshallers,
+            operation_index=operation_index,
+            staged=asbool(
+                config.registry.settings.get(
+                    "pyramid_openapi3.staged_request_validation"
+                )
+            ),
         ),
         "response_validator": response_validator(
             spec,
             extra_format_validators=custom_formatters,
             extra_media_type_deserializers=custom_deserializers,
+            operation_index=operation_index,
+        ),
+        # Used for streaming responses, whose body we don't want to read
+        "response_headers_validator": response_headers_validator(
+            spec,
+            extra_format_validators=custom_formatters,
+            extra_media_type_deserializers=custom_deserializers,
+            operation_index=operation_index,
         ),
     }
 
@@ -419,14 +573,21 @@ def register_routes(
     root_factory_ext: str = "x-pyramid-root-factory",
     apiname: str = "pyramid_openapi3",
     route_prefix: str | None = None,
+    *,
+    radix_dispatch: bool = False,
 ) -> None:
     """Register routes to app from OpenApi 3.0 specification.
 
     :param route_name_ext: Extension's key for using a ``route_name`` argument
     :param root_factory_ext: Extension's key for using a ``factory`` argument
+    :param radix_dispatch:
+        Match requests to routes with a `RadixRoutesMapper`, which finds
+        the route in time independent of the number of routes.
     """
 
     def action() -> None:
+        if radix_dispatch:
+            install_radix_mapper(config)
         spec = config.registry.settings[apiname]["spec"]
         for pattern, path_item in spec["paths"].items():
             route_name = path_item.get(route_name_ext)
@@ -452,8 +613,7 @@ def openapi_validation_error(
     if isinstance(context, ResponseValidationError):
         logger.error(context)
 
-    extract_errors = request.registry.settings["pyramid_openapi3_extract_errors"]
-    errors = list(extract_errors(request, context.errors))
+    errors = get_extracted_errors(request, context.errors)
 
     # If validation failed for request, it is user's fault (-> 400), but if
     # validation failed for response, it is our fault (-> 500)
@@ -466,7 +626,10 @@ def openapi_validation_error(
     if isinstance(context, ResponseValidationError):
         status_code = 500
 
-    return exception_response(status_code, json_body=errors)
+    codec = get_json_codec(request.registry.settings)
+    return exception_response(
+        status_code, body=codec.encode(errors), content_type="application/json"
+    )
 
 
 def check_all_routes(event: ApplicationCreated) -> None:
@@ -475,14 +638,6 @@ def check_all_routes(event: ApplicationCreated) -> None:
     Listen for ApplicationCreated event and assert all endpoints defined in
     the API spec have been registered as Pyramid routes.
     """
-
-    def remove_prefixes(path: str) -> str:
-        path = f"/{path}" if not path.startswith("/") else path
-        for prefix in prefixes:
-            if path == prefix or path.startswith(prefix + "/"):
-                return path[len(prefix) :] or "/"
-        return path
-
     app = event.app
     settings = app.registry.settings
     apinames = settings.get("pyramid_openapi3_apinames")
@@ -494,33 +649,41 @@ def check_all_routes(event: ApplicationCreated) -> None:
         )
         return
 
-    for name in apinames:  # pragma: no branch
-        openapi_settings = settings[name]
+    if not settings.get("pyramid_openapi3.enable_endpoint_validation", True):
+        logger.info("Endpoint validation against specification is disabled")
+        return
 
-        if not settings.get("pyramid_openapi3.enable_endpoint_validation", True):
-            logger.info("Endpoint validation against specification is disabled")
-            return
+    settings.setdefault("pyramid_openapi3", {})
+    settings["pyramid_openapi3"].setdefault("routes", {})
+    route_settings = settings.setdefault("pyramid_openapi3_route_settings", {})
+    route_paths = {
+        route_name: route.path for route_name, route in app.routes_mapper.routes.items()
+    }
 
-        prefixes = _get_server_prefixes(openapi_settings["spec"])
+    for name in apinames:
+        openapi_settings = settings[name]
+        trie = PrefixTrie(_get_server_prefixes(openapi_settings["spec"]))
+        routes = {
+            route_name: trie.remove_prefix(path)
+            for route_name, path in route_paths.items()
+        }
 
         paths = list(openapi_settings["spec"]["paths"].keys())
-        routes = [
-            remove_prefixes(route.path) for route in app.routes_mapper.routes.values()
-        ]
-
-        missing = [r for r in paths if r not in routes]
+        registered = set(routes.values())
+        missing = [p for p in paths if p not in registered]
         if missing:
             raise MissingEndpointsError(missing)
 
-        settings.setdefault("pyramid_openapi3", {})
-        settings["pyramid_openapi3"].setdefault("routes", {})
-
         # It is possible to have multiple `add_route` for a single path
         # (due to request_method predicates). So loop through each route
-        # to create a lookup of route_name -> api_name
-        for route_name, route in app.routes_mapper.routes.items():
-            if remove_prefixes(route.path) in paths:
+        # to create a lookup of route_name -> api_name, and index the
+        # route's operations so validation can skip openapi-core's path finding
+        spec_paths = set(paths)
+        for route_name, path in routes.items():
+            if path in spec_paths:
                 settings["pyramid_openapi3"]["routes"][route_name] = name
+                route_settings[route_name] = openapi_settings
+                openapi_settings["operation_index"].add(route_name, path)
 
 
 def _get_server_prefixes(spec: SchemaPath) -> list[str]:
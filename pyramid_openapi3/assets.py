@@ -0,0 +1,160 @@
+"""Serve in-memory documents with ETags and precompressed variants."""
+
+from pyramid.httpexceptions import HTTPNotModified
+from pyramid.request import Request
+from pyramid.response import Response
+from string import Template
+from webob.acceptparse import create_accept_encoding_header
+from webob.etag import ETagMatcher
+
+import gzip
+import hashlib
+import json
+import typing as t
+
+try:
+    from brotli import compress as brotli_compress  # ty: ignore[unresolved-import]
+except ImportError:  # pragma: no cover
+    brotli_compress = None
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Return whether the client's If-None-Match matches `etag`.
+
+    Reads the header rather than `request.if_none_match`, so this also
+    works with `pyramid.testing.DummyRequest`.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    return bool(if_none_match) and etag in ETagMatcher.parse(
+        if_none_match, strong=False
+    )
+
+
+class StaticDocument:
+    """A document rendered once at config time and served from memory.
+
+    Every encoding variant is compressed up front and gets its own strong
+    ETag, so conditional requests are answered with 304 Not Modified.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        content_type: str,
+        charset: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        self.content_type = content_type
+        self.charset = charset
+        self.cache_control = cache_control
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: dict[str, tuple[bytes, str]] = {"identity": (body, digest)}
+        self.variants["gzip"] = (gzip.compress(body, mtime=0), f"{digest}-gzip")
+        if brotli_compress is not None:  # pragma: no cover
+            self.variants["br"] = (brotli_compress(body), f"{digest}-br")
+
+        # Prefer the smallest variant when the client accepts several equally.
+        self.offers = sorted(
+            self.variants, key=lambda name: len(self.variants[name][0])
+        )
+
+    def __call__(self, request: Request) -> Response:
+        """Pyramid view serving the variant best matching Accept-Encoding."""
+        encoding = self.negotiate(request)
+        body, etag = self.variants[encoding]
+
+        if is_not_modified(request, etag):
+            response: Response = HTTPNotModified()
+        else:
+            response = Response(
+                body, content_type=self.content_type, charset=self.charset
+            )
+            if encoding != "identity":
+                response.content_encoding = encoding
+        response.etag = etag
+        response.vary = ("Accept-Encoding",)
+        if self.cache_control is not None:
+            response.cache_control = self.cache_control
+        return response
+
+    def negotiate(self, request: Request) -> str:
+        """Return the name of the variant to send for the request."""
+        accept_encoding = create_accept_encoding_header(
+            request.headers.get("Accept-Encoding")
+        )
+        if not accept_encoding:
+            return "identity"
+        offers = accept_encoding.acceptable_offers(self.offers)
+        if not offers:
+            return "identity"
+        best = max(quality for _, quality in offers)
+        return next(name for name, quality in offers if quality == best)
+
+
+class ExplorerPage:
+    """The Swagger UI page, rendered once at config time.
+
+    Only the spec URL, the OAuth redirect URL and the CSP nonce depend on
+    the request; they are spliced into the pre-rendered page on every hit.
+    """
+
+    # NUL never survives json.dumps unescaped, so these can't clash with config
+    SPEC_URL = json.dumps("\0spec_url\0")
+    OAUTH_REDIRECT_URL = json.dumps("\0oauth2_redirect_url\0")
+    NONCE_ATTR = "\0nonce_attr\0"
+
+    def __init__(
+        self,
+        template: str,
+        ui_version: str,
+        ui_config: dict[str, t.Any] | None = None,
+        oauth_config: dict[str, t.Any] | None = None,
+    ) -> None:
+        merged_ui_config = {
+            "url": json.loads(self.SPEC_URL),
+            "dom_id": "#swagger-ui",
+            "deepLinking": True,
+            "validatorUrl": None,
+            "layout": "StandaloneLayout",
+            "oauth2RedirectUrl": json.loads(self.OAUTH_REDIRECT_URL),
+        }
+        if ui_config:
+            merged_ui_config.update(ui_config)
+        self.html = Template(template).safe_substitute(
+            ui_version=ui_version,
+            ui_config=json.dumps(merged_ui_config),
+            oauth_config=json.dumps(oauth_config),
+            nonce_attr=self.NONCE_ATTR,
+        )
+
+    def render(
+        self, spec_url: str, oauth_redirect_url: str, nonce: str | None = None
+    ) -> str:
+        """Fill in the request dependent parts of the page."""
+        nonce_attr = f' nonce="{nonce}"' if nonce else ""
+        return (
+            self.html.replace(self.SPEC_URL, json.dumps(spec_url))
+            .replace(self.OAUTH_REDIRECT_URL, json.dumps(oauth_redirect_url))
+            .replace(self.NONCE_ATTR, nonce_attr)
+        )
+
+    def __call__(
+        self, request: Request, spec_url: str, oauth_redirect_url: str
+    ) -> Response:
+        """Return the page, or 304 Not Modified if the client has it cached.
+
+        Pages with a CSP nonce differ on every request, so they get no ETag.
+        """
+        nonce = getattr(request, "csp_nonce", None)
+        html = self.render(spec_url, oauth_redirect_url, nonce)
+        if nonce:
+            return Response(html)
+
+        etag = hashlib.sha256(html.encode("utf-8")).hexdigest()[:32]
+        if is_not_modified(request, etag):
+            response: Response = HTTPNotModified()
+        else:
+            response = Response(html)
+        response.etag = etag
+        return response
@@ -0,0 +1,68 @@
+"""The JSON encoder and decoder used throughout pyramid_openapi3."""
+
+from dataclasses import dataclass
+from pyramid.exceptions import ConfigurationError
+from pyramid.path import DottedNameResolver
+
+import functools
+import json
+import typing as t
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """A pair of `dumps` and `loads` functions.
+
+    `dumps` may return str (like json and ujson) or bytes (like orjson), and
+    must accept a `default` keyword argument to be used by renderers.
+    """
+
+    dumps: t.Callable[..., str | bytes]
+    loads: t.Callable[[str | bytes], t.Any]
+
+    @classmethod
+    def resolve(cls, name: str) -> "JSONCodec":
+        """Use the `dumps` and `loads` of a module, e.g. `orjson`."""
+        try:
+            module = DottedNameResolver().maybe_resolve(name)
+        except ImportError:
+            module = None
+        if not callable(getattr(module, "dumps", None)) or not callable(
+            getattr(module, "loads", None)
+        ):
+            raise ConfigurationError(
+                "pyramid_openapi3.json_codec must name a module with dumps and "
+                f"loads functions, e.g. orjson, got {name!r}"
+            )
+        return cls(dumps=module.dumps, loads=module.loads)
+
+    def encode(self, value: t.Any) -> bytes:
+        """Serialize `value` to UTF-8 encoded JSON."""
+        data = self.dumps(value)
+        return data.encode("utf-8") if isinstance(data, str) else data
+
+    def deserialize(self, value: bytes, **parameters: str) -> t.Any:
+        """Parse a JSON body, as an openapi-core media type deserializer."""
+        return self.loads(value)
+
+
+# Compact, like WebOb's `json_body` setter
+STDLIB = JSONCodec(
+    dumps=functools.partial(json.dumps, separators=(",", ":")), loads=json.loads
+)
+
+JSON_MEDIA_TYPES = ("application/json", "application/vnd.api+json")
+
+
+def get_json_codec(settings: t.MutableMapping[str, t.Any]) -> JSONCodec:
+    """Return the configured JSON codec, the standard library's by default.
+
+    `pyramid_openapi3.json_codec` is resolved to a `JSONCodec` once and
+    stored in the settings.
+    """
+    codec = settings.get("pyramid_openapi3_json_codec")
+    if codec is None:
+        name = settings.get("pyramid_openapi3.json_codec")
+        codec = STDLIB if name is None else JSONCodec.resolve(name)
+        settings["pyramid_openapi3_json_codec"] = codec
+    return codec
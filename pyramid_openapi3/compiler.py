@@ -0,0 +1,122 @@
+"""Compile a spec into an artifact that loads without parsing or validation.
+
+Usage::
+
+    pyramid-openapi3-compile openapi.yaml -o openapi.compiled.json
+
+and then::
+
+    config.pyramid_openapi3_spec("openapi.yaml", compiled="openapi.compiled.json")
+"""
+
+from .loaders import read_spec
+from .validation_cache import referenced_files
+from importlib.metadata import version
+from openapi_spec_validator import validate
+from pathlib import Path
+
+import argparse
+import hashlib
+import json
+import logging
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 2
+
+
+def compile_spec(filepath: str | Path) -> dict[str, t.Any]:
+    """Parse and validate the spec, returning a JSON-serializable artifact.
+
+    Besides the parsed spec, the artifact records the name of the spec file
+    and hashes of it and all files it references, so that an artifact of
+    another spec, or a stale one, can be detected on load.
+    """
+    path = Path(filepath).resolve()
+    spec_dict = read_spec(path)
+    validate(spec_dict, base_uri=path.as_uri())
+    return {
+        "format": ARTIFACT_FORMAT,
+        "openapi_spec_validator": version("openapi-spec-validator"),
+        "root": path.name,
+        "files": {
+            name: hashlib.sha256(content).hexdigest()
+            for name, content in referenced_files(spec_dict, path).items()
+        },
+        "spec": spec_dict,
+    }
+
+
+def load_compiled(
+    artifact_path: str | Path, filepath: str | Path
+) -> dict[str, t.Any] | None:
+    """Return the spec stored in a compiled artifact.
+
+    Returns None, so that the caller loads `filepath` the regular way, if
+    the artifact is missing, was compiled by an incompatible version or
+    from another spec file, or any of the spec files changed since it was
+    compiled.
+    """
+    try:
+        artifact = json.loads(Path(artifact_path).read_bytes())
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring compiled spec %s: %s", artifact_path, e)
+        return None
+
+    if artifact.get("format") != ARTIFACT_FORMAT or artifact.get(
+        "openapi_spec_validator"
+    ) != version("openapi-spec-validator"):
+        logger.warning(
+            "Ignoring compiled spec %s: compiled by another version", artifact_path
+        )
+        return None
+
+    if artifact.get("root") != Path(filepath).name:
+        logger.warning(
+            "Ignoring compiled spec %s: compiled from %s, not %s",
+            artifact_path,
+            artifact.get("root"),
+            Path(filepath).name,
+        )
+        return None
+
+    root = Path(filepath).resolve().parent
+    for name, digest in artifact["files"].items():
+        try:
+            content = (root / name).read_bytes()
+        except OSError:
+            content = None
+        if content is None or hashlib.sha256(content).hexdigest() != digest:
+            logger.warning(
+                "Ignoring compiled spec %s: %s changed since it was compiled",
+                artifact_path,
+                name,
+            )
+            return None
+
+    logger.debug("Loaded compiled spec %s", artifact_path)
+    return artifact["spec"]
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    """Console entry point."""
+    parser = argparse.ArgumentParser(
+        prog="pyramid-openapi3-compile",
+        description="Validate an OpenAPI document and compile it for fast loading.",
+    )
+    parser.add_argument("spec", help="path to the root spec file")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="where to write the artifact, defaults to <spec>.compiled.json",
+    )
+    args = parser.parse_args(argv)
+
+    output = Path(args.output or Path(args.spec).with_suffix(".compiled.json"))
+    output.write_text(json.dumps(compile_spec(args.spec)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
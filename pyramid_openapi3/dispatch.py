@@ -0,0 +1,162 @@
+"""Find the matching route in a trie of path segments."""
+
+from pyramid.config import Configurator
+from pyramid.exceptions import URLDecodeError
+from pyramid.interfaces import IRoutesMapper
+from pyramid.request import Request
+from pyramid.urldispatch import Route
+from pyramid.urldispatch import RoutesMapper
+
+import heapq
+import re
+import typing as t
+
+# Segments matched by a plain ``{name}`` placeholder, i.e. ``[^/]+``
+_PLACEHOLDER = re.compile(r"\{[_a-zA-Z]\w*\}")
+
+
+class RadixRoutesMapper(RoutesMapper):
+    """A RoutesMapper that doesn't try every route in turn.
+
+    Pyramid matches a request against the regex of one route after the
+    other, so the last of 1,500 routes costs 1,500 regex matches. Routes
+    whose patterns only have literal and ``{name}`` segments, as OpenAPI
+    path templates do, are put into a trie of path segments instead, which
+    finds the routes that can match a path in time linear in its segments.
+
+    Only these candidates and the routes with other patterns, such as
+    ``{name:regex}`` or ``*remainder``, are then matched in the order they
+    were added, with their predicates, so the result is the same as with
+    Pyramid's RoutesMapper.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._index: _RouteIndex | None = None
+
+    def __call__(self, request: Request) -> dict[str, t.Any]:
+        """Return the first matching route and its matchdict."""
+        try:
+            # empty if mounted under a path in mod_wsgi, for example
+            path = request.path_info or "/"
+        except KeyError:
+            path = "/"
+        except UnicodeDecodeError as e:
+            raise URLDecodeError(e.encoding, e.object, e.start, e.end, e.reason) from e
+
+        # Route regexes end with `$`, which also matches before a final newline
+        if not path.startswith("/") or path.endswith("\n"):
+            return super().__call__(request)
+
+        index = self._index
+        if index is None or not index.is_current(self.routelist):
+            index = self._index = _RouteIndex(self.routelist)
+
+        for route in index.candidates(path):
+            match = route.match(path)
+            if match is not None:
+                preds = route.predicates
+                info = {"match": match, "route": route}
+                if preds and not all(p(info, request) for p in preds):
+                    continue
+                return info
+
+        return {"route": None, "match": None}
+
+
+def install_radix_mapper(config: Configurator) -> RadixRoutesMapper:
+    """Replace the app's RoutesMapper with a RadixRoutesMapper.
+
+    The new mapper shares the routes of the old one, as `add_route` connects
+    routes to the mapper there was when it was called, in a later action.
+    """
+    mapper = config.get_routes_mapper()
+    if isinstance(mapper, RadixRoutesMapper):
+        return mapper
+
+    radix = RadixRoutesMapper()
+    radix.routelist = mapper.routelist
+    radix.static_routes = mapper.static_routes
+    radix.routes = mapper.routes
+    config.registry.registerUtility(radix, IRoutesMapper)
+    return radix
+
+
+class _RouteIndex:
+    """Routes in a trie of path segments, and the routes that aren't."""
+
+    def __init__(self, routes: list[Route]) -> None:
+        self.routes = list(routes)
+        self.root = _RouteTrieNode()
+        self.unindexed: list[int] = []
+        for order, route in enumerate(routes):
+            segments = _segments(route.pattern)
+            if segments is None:
+                self.unindexed.append(order)
+                continue
+            node = self.root
+            for segment in segments:
+                if segment is None:
+                    node.placeholder = node.placeholder or _RouteTrieNode()
+                    node = node.placeholder
+                else:
+                    node = node.children.setdefault(segment, _RouteTrieNode())
+            node.routes.append(order)
+
+    def is_current(self, routes: list[Route]) -> bool:
+        """Return whether no routes were added or replaced since indexing.
+
+        RoutesMapper only ever appends routes, replaced ones included.
+        """
+        return len(routes) == len(self.routes) and (
+            not routes or routes[-1] is self.routes[-1]
+        )
+
+    def candidates(self, path: str) -> list[Route]:
+        """Return the routes that can match `path`, in the order they were added."""
+        segments = path.split("/")[1:]
+        found: list[int] = []
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth == len(segments):
+                found.extend(node.routes)
+                continue
+            segment = segments[depth]
+            child = node.children.get(segment)
+            if child is not None:
+                stack.append((child, depth + 1))
+            if node.placeholder is not None and segment:
+                stack.append((node.placeholder, depth + 1))
+        return [
+            self.routes[order] for order in heapq.merge(sorted(found), self.unindexed)
+        ]
+
+
+class _RouteTrieNode:
+    __slots__ = ("children", "placeholder", "routes")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _RouteTrieNode] = {}
+        self.placeholder: _RouteTrieNode | None = None
+        self.routes: list[int] = []
+
+
+def _segments(pattern: str | bytes) -> list[str | None] | None:
+    """Split a route pattern into literal segments and None for placeholders.
+
+    Return None if the pattern has other kinds of segments.
+    """
+    if not isinstance(pattern, str):
+        return None
+    if not pattern.startswith("/"):
+        pattern = f"/{pattern}"
+    segments: list[str | None] = []
+    for segment in pattern.split("/")[1:]:
+        if _PLACEHOLDER.fullmatch(segment):
+            segments.append(None)
+        elif any(char in segment for char in "{}*:"):
+            return None
+        else:
+            segments.append(segment)
+    return segments
@@ -0,0 +1,69 @@
+"""Validate requests right after routing, before any context is created."""
+
+from .exceptions import RequestValidationError
+from .policy import ValidationPolicy
+from pyramid.events import ApplicationCreated
+from pyramid.events import BeforeTraversal
+
+import typing as t
+
+
+class EarlyRequestValidation:
+    """Validate requests to `openapi=True` views as soon as a route matches.
+
+    Request validation otherwise happens when the view is called, i.e. after
+    the root factory, traversal and the permission check, which can be
+    expensive. Subscribed to BeforeTraversal, this rejects invalid requests
+    before any of these run.
+
+    Only routes whose views are all `openapi=True`, and only the operations
+    in the spec, are validated early. For everything else, validation is
+    left to the view.
+    """
+
+    def __init__(self, settings: t.MutableMapping[str, t.Any]) -> None:
+        self.settings = settings
+        self.policy: ValidationPolicy | None = None
+        self.routes: frozenset[str] = frozenset()
+
+    def collect_routes(self, event: ApplicationCreated) -> None:
+        """Find the routes whose views all validate requests.
+
+        The policy is resolved here too, so that settings changed after
+        `config.include("pyramid_openapi3")` are taken into account.
+        """
+        self.policy = ValidationPolicy.from_settings(self.settings)
+        openapi: dict[str, bool] = {}
+        for item in event.app.registry.introspector.get_category("views"):
+            view = item["introspectable"]
+            route_name = view["route_name"]
+            if route_name is not None:
+                openapi[route_name] = openapi.get(route_name, True) and bool(
+                    view.get("openapi")
+                )
+        self.routes = frozenset(name for name, enabled in openapi.items() if enabled)
+
+    def __call__(self, event: BeforeTraversal) -> None:
+        """Validate the request, if its route and operation are known."""
+        request = event.request
+        route = getattr(request, "matched_route", None)
+        if (
+            self.policy is None
+            or not self.policy.validate_request
+            or route is None
+            or route.name not in self.routes
+        ):
+            return
+        api_settings = self.settings.get("pyramid_openapi3_route_settings", {}).get(
+            route.name
+        )
+        if (
+            api_settings is None
+            or api_settings["operation_index"].get(route.name, request.method.lower())
+            is None
+        ):
+            return
+
+        self.policy.apply(request)
+        if request.openapi_validated.errors:
+            raise RequestValidationError(errors=request.openapi_validated.errors)
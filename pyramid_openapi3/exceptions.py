@@ -143,6 +143,23 @@ def extract_errors(
         yield output
 
 
+def get_extracted_errors(
+    request: Request, errors: list[Exception]
+) -> list[dict[str, str]]:
+    """Return errors as extracted by the configured extract_errors function.
+
+    The result is kept on the request, so that errors that are reported to
+    the metrics sink and then rendered are extracted only once.
+    """
+    cached = request.environ.get("pyramid_openapi3.extracted_errors")
+    if cached is not None and cached[0] is errors:
+        return cached[1]
+    extract_errors = request.registry.settings["pyramid_openapi3_extract_errors"]
+    extracted = list(extract_errors(request, errors))
+    request.environ["pyramid_openapi3.extracted_errors"] = (errors, extracted)
+    return extracted
+
+
 class MissingEndpointsError(Exception):
     """Error raised when endpoints are not found."""
 
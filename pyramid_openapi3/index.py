@@ -0,0 +1,136 @@
+"""Precompiled lookup of spec operations by Pyramid route."""
+
+from jsonschema_path import SchemaPath
+from openapi_core.templating.datatypes import TemplateResult
+from openapi_core.templating.paths.datatypes import PathOperation
+from openapi_core.templating.paths.datatypes import PathOperationServer
+from openapi_core.templating.paths.exceptions import ServerNotFound
+from openapi_core.templating.paths.finders import APICallPathFinder
+from urllib.parse import urljoin
+
+import typing as t
+
+HTTP_METHODS = frozenset(
+    ("get", "put", "post", "delete", "options", "head", "patch", "trace", "query")
+)
+
+
+class OperationIndex:
+    """Map ``(route_name, method)`` to the spec path item and operation.
+
+    openapi-core finds the operation for a request by matching its URL
+    against every path in the spec, which scales linearly with spec size.
+    Pyramid has already matched the route, so we resolve the operation
+    once per route at ``ApplicationCreated`` time and only match servers
+    per request.
+    """
+
+    def __init__(self, spec: SchemaPath) -> None:
+        self.spec = spec
+        self._operations: dict[tuple[str, str], PathOperation] = {}
+        self._empty: set[tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        """Return the number of indexed ``(route_name, method)`` pairs."""
+        return len(self._operations)
+
+    def add(self, route_name: str, path_pattern: str) -> None:
+        """Index all operations of the spec path ``path_pattern`` for a route."""
+        path = self.spec["paths"][path_pattern]
+        path_result = TemplateResult(path_pattern, {})
+        for method in path.keys():  # noqa: SIM118
+            if method in HTTP_METHODS:
+                operation = path / method
+                self._operations[(route_name, method)] = PathOperation(
+                    path, operation, path_result
+                )
+                if self._has_nothing_to_validate(path, operation):
+                    self._empty.add((route_name, method))
+
+    def _has_nothing_to_validate(self, path: SchemaPath, operation: SchemaPath) -> bool:
+        security = (
+            operation.get("security")
+            if "security" in operation
+            else self.spec.get("security")
+        )
+        return not (
+            path.get("parameters")
+            or operation.get("parameters")
+            or "requestBody" in operation
+            or security
+        )
+
+    def is_empty(self, route_name: str | None, method: str) -> bool:
+        """Return whether the operation has no parameters, body or security.
+
+        Requests to such operations can only fail validation if their
+        server is unknown, and never produce any validated data.
+        """
+        return (route_name, method) in self._empty
+
+    def get(self, route_name: str, method: str) -> PathOperation | None:
+        """Return the indexed path operation, if any."""
+        return self._operations.get((route_name, method))
+
+    def find(
+        self, request: t.Any, path_finder: APICallPathFinder
+    ) -> PathOperationServer | None:
+        """Resolve path, operation and server for an openapi request wrapper.
+
+        Return None if the matched route is not indexed, so that the caller
+        can fall back to openapi-core's path finder.
+        """
+        path_operation = self._operations.get((request.route_name, request.method))
+        if path_operation is None:
+            return None
+
+        full_url = urljoin(request.host_url, request.path_pattern)
+        servers = path_finder.servers_iterator(
+            full_url, iter((path_operation,)), self.spec, base_url=path_finder.base_url
+        )
+        try:
+            return next(servers)
+        except StopIteration:
+            raise ServerNotFound(full_url) from None
+
+
+class PrefixTrie:
+    """Strip server URL prefixes (e.g. ``/api/v1``) off route paths.
+
+    Prefixes match whole path segments. When several match, the one added
+    first wins, as with a scan over the spec's servers in order, but the
+    lookup is linear in the number of segments rather than of prefixes.
+    """
+
+    def __init__(self, prefixes: t.Iterable[str] = ()) -> None:
+        self._root = _PrefixTrieNode()
+        for order, prefix in enumerate(prefixes):
+            node = self._root
+            for segment in prefix.split("/")[1:]:
+                node = node.children.setdefault(segment, _PrefixTrieNode())
+            if node.prefix is None:
+                node.order, node.prefix = order, prefix
+
+    def remove_prefix(self, path: str) -> str:
+        """Return `path` with a leading slash and without its server prefix."""
+        path = f"/{path}" if not path.startswith("/") else path
+        node: _PrefixTrieNode | None = self._root
+        best: tuple[int, str] | None = None
+        for segment in path.split("/")[1:]:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.prefix is not None and (best is None or node.order < best[0]):
+                best = (node.order, node.prefix)
+        if best is None:
+            return path
+        return path[len(best[1]) :] or "/"
+
+
+class _PrefixTrieNode:
+    __slots__ = ("children", "order", "prefix")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _PrefixTrieNode] = {}
+        self.order = 0
+        self.prefix: str | None = None
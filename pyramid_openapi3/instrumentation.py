@@ -0,0 +1,62 @@
+"""Report validations to the metrics sink and the slow validation log."""
+
+from .metrics import failure_classes
+from .policy import get_api_settings
+from .slowlog import SchemaTimings
+from contextlib import contextmanager
+from pyramid.request import Request
+
+import time
+import typing as t
+
+
+class Observation:
+    """The outcome of a validation, filled in by the observed code."""
+
+    __slots__ = ("body_size", "errors", "submitted")
+
+    def __init__(self) -> None:
+        self.errors: list[Exception] = []
+        self.body_size: int | None = None
+        self.submitted = False
+
+    def record(self, errors: list[Exception] | None, body_size: int | None) -> None:
+        """Record validation errors, None if validation was submitted elsewhere."""
+        if errors is None:
+            self.submitted = True
+        else:
+            self.errors = errors
+        self.body_size = body_size
+
+
+@contextmanager
+def observe(request: Request, kind: str) -> t.Generator[Observation, None, None]:
+    """Time the validation done in the block and report it.
+
+    Nothing is reported if the block raises, or if the validation was
+    submitted to be done in the background.
+    """
+    metrics = request.environ.get("pyramid_openapi3.metrics")
+    slow_log = request.environ.get("pyramid_openapi3.slow_log")
+    observation = Observation()
+    schemas = SchemaTimings()
+    start = time.perf_counter()
+    if slow_log is None:
+        yield observation
+    else:
+        with schemas.activate():
+            yield observation
+    seconds = time.perf_counter() - start
+    if observation.submitted:
+        return
+
+    if metrics is not None:
+        metrics.validated(
+            kind,
+            request.matched_route.name,
+            get_api_settings(request)["apiname"],
+            seconds,
+            failure_classes(request, observation.errors),
+        )
+    if slow_log is not None:
+        slow_log.check(kind, request, seconds, schemas, observation.body_size)
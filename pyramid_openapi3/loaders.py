@@ -0,0 +1,47 @@
+"""Parse spec files with the fastest parser available."""
+
+from jsonschema_path.handlers import file_handler
+from pathlib import Path
+
+import io
+import json
+import logging
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+# jsonschema-path's YAML loader is built on top of libyaml's CSafeLoader when
+# PyYAML was compiled with it, and on the pure Python SafeLoader otherwise.
+YAML_LOADER = (
+    "libyaml"
+    if any(base.__name__ == "CSafeLoader" for base in file_handler.loader.__mro__)
+    else "pure Python YAML"
+)
+
+
+def parse_spec(content: bytes, filename: str | Path) -> t.Any:
+    """Parse the contents of a spec file.
+
+    `.json` files are parsed with the stdlib JSON parser. Anything else is
+    parsed as YAML by jsonschema-path's file handler, as
+    `openapi_spec_validator`'s readers do.
+    """
+    if Path(filename).suffix == ".json":
+        return json.loads(content)
+    stream = io.StringIO(content.decode("utf-8"))
+    return file_handler(stream)  # ty: ignore[invalid-argument-type]
+
+
+def read_spec(filepath: str | Path, content: bytes | None = None) -> t.Any:
+    """Read and parse a spec file, logging which parser was used.
+
+    Pass the `content` of the file if it was already read.
+    """
+    path = Path(filepath)
+    if content is None:
+        content = path.read_bytes()
+    spec_dict = parse_spec(content, path)
+    logger.info(
+        "Parsed %s with %s", path, "json" if path.suffix == ".json" else YAML_LOADER
+    )
+    return spec_dict
@@ -0,0 +1,198 @@
+"""Count and time validations, in-process."""
+
+from .exceptions import extract_errors
+from .exceptions import get_extracted_errors
+from bisect import bisect_left
+from pyramid.request import Request
+from pyramid.settings import asbool
+
+import threading
+import typing as t
+
+# Upper bounds, in seconds, of the validation duration histogram buckets
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+# kind ("request" or "response"), route name and API name
+Labels = tuple[str, str, str]
+_LABEL_NAMES = ("kind", "route", "api")
+
+
+class MetricsSink(t.Protocol):
+    """Receives the outcome of every validation of an `openapi=True` view.
+
+    Set your own as `registry.settings["pyramid_openapi3_metrics"]` to
+    forward metrics to e.g. StatsD instead of collecting them in-process.
+    """
+
+    def validated(
+        self,
+        kind: str,
+        route: str,
+        api: str,
+        seconds: float,
+        failures: t.Collection[str],
+    ) -> None:
+        """Record a validation, `failures` are its exception class names."""
+
+    def skipped(self, kind: str, route: str, api: str) -> None:
+        """Record a validation that was disabled or not sampled."""
+
+
+class _Histogram:
+    __slots__ = ("count", "counts", "sum")
+
+    def __init__(self, buckets: int) -> None:
+        # Not cumulative, the last one counts values above all buckets
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+def _labels(names: t.Iterable[str], values: t.Iterable[str]) -> str:
+    escaped = (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in values
+    )
+    pairs = (f'{name}="{value}"' for name, value in zip(names, escaped, strict=True))
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """Collect validation metrics in memory and render them for Prometheus.
+
+    Validations are counted and timed per kind, route and API; failed
+    validations are also counted per exception class.
+    """
+
+    def __init__(self, buckets: t.Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.validations: dict[Labels, int] = {}
+        self.failures: dict[tuple[str, str, str, str], int] = {}
+        self.skips: dict[Labels, int] = {}
+        self.durations: dict[Labels, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def validated(
+        self,
+        kind: str,
+        route: str,
+        api: str,
+        seconds: float,
+        failures: t.Collection[str],
+    ) -> None:
+        """Count and time a validation."""
+        labels = (kind, route, api)
+        with self._lock:
+            self.validations[labels] = self.validations.get(labels, 0) + 1
+            for exception in failures:
+                key = (*labels, exception)
+                self.failures[key] = self.failures.get(key, 0) + 1
+            histogram = self.durations.get(labels)
+            if histogram is None:
+                histogram = self.durations[labels] = _Histogram(len(self.buckets))
+            histogram.counts[bisect_left(self.buckets, seconds)] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+
+    def skipped(self, kind: str, route: str, api: str) -> None:
+        """Count a skipped validation."""
+        labels = (kind, route, api)
+        with self._lock:
+            self.skips[labels] = self.skips.get(labels, 0) + 1
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def header(name: str, kind: str, description: str) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, description, values, names in (
+                (
+                    "pyramid_openapi3_validations_total",
+                    "Validations of requests and responses.",
+                    self.validations,
+                    _LABEL_NAMES,
+                ),
+                (
+                    "pyramid_openapi3_validations_skipped_total",
+                    "Validations that were disabled or not sampled.",
+                    self.skips,
+                    _LABEL_NAMES,
+                ),
+                (
+                    "pyramid_openapi3_validation_failures_total",
+                    "Failed validations, by exception class.",
+                    self.failures,
+                    (*_LABEL_NAMES, "exception"),
+                ),
+            ):
+                header(name, "counter", description)
+                for key, value in sorted(values.items()):
+                    lines.append(f"{name}{_labels(names, key)} {value}")
+
+            name = "pyramid_openapi3_validation_duration_seconds"
+            header(name, "histogram", "Time spent validating.")
+            bounds = [*(repr(bound) for bound in self.buckets), "+Inf"]
+            for key, histogram in sorted(self.durations.items()):
+                cumulative = 0
+                for bound, count in zip(bounds, histogram.counts, strict=True):
+                    cumulative += count
+                    labels = _labels((*_LABEL_NAMES, "le"), (*key, bound))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _labels(_LABEL_NAMES, key)
+                lines.append(f"{name}_sum{labels} {histogram.sum!r}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def get_metrics(settings: t.MutableMapping[str, t.Any]) -> MetricsSink | None:
+    """Return the configured metrics sink, if metrics are enabled.
+
+    With `pyramid_openapi3.metrics` enabled and no sink configured, a
+    `MetricsRegistry` is created and stored in the settings.
+    """
+    metrics = settings.get("pyramid_openapi3_metrics")
+    if metrics is None and asbool(settings.get("pyramid_openapi3.metrics")):
+        metrics = settings["pyramid_openapi3_metrics"] = MetricsRegistry()
+    return metrics
+
+
+def failure_classes(request: Request, errors: list[t.Any]) -> set[str]:
+    """Return the exception class names of errors, as reported to clients.
+
+    Falls back to the class names of the raw errors if a custom
+    extract_errors function doesn't report them.
+    """
+    if not errors:
+        return set()
+    extracted = get_extracted_errors(request, errors)
+    if all("exception" in error for error in extracted):
+        return {error["exception"] for error in extracted}
+    return {type(error).__name__ for error in errors}
+
+
+def error_classes(errors: list[t.Any]) -> set[str]:
+    """Return the exception class names of errors, without a request.
+
+    They are named as the default extract_errors does, for responses
+    validated in the background, whose errors are never sent to clients.
+    """
+    return {error["exception"] for error in extract_errors(None, errors)}  # ty: ignore[invalid-argument-type]
@@ -0,0 +1,95 @@
+"""Validation settings, resolved once at config time."""
+
+from .metrics import MetricsSink
+from .metrics import get_metrics
+from .slowlog import SlowValidationLog
+from .timing import PhaseTimings
+from dataclasses import dataclass
+from dataclasses import field
+from pyramid.request import Request
+from pyramid.settings import asbool
+
+import typing as t
+
+
+@dataclass(frozen=True)
+class ValidationPolicy:
+    """Which validations run for an `openapi=True` view."""
+
+    validate_request: bool = True
+    validate_response: bool = True
+    record_timings: bool = False
+    metrics: MetricsSink | None = field(default=None, compare=False)
+    slow_log: SlowValidationLog | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_settings(
+        cls, settings: t.MutableMapping[str, t.Any]
+    ) -> "ValidationPolicy":
+        """Resolve the policy from registry settings."""
+        return cls(
+            validate_request=asbool(
+                settings.get("pyramid_openapi3.enable_request_validation", True)
+            ),
+            validate_response=asbool(
+                settings.get("pyramid_openapi3.enable_response_validation", True)
+            ),
+            record_timings=asbool(settings.get("pyramid_openapi3.record_timings"))
+            or asbool(settings.get("pyramid_openapi3.server_timing")),
+            metrics=get_metrics(settings),
+            slow_log=SlowValidationLog.from_settings(settings),
+        )
+
+    def apply(self, request: Request) -> None:
+        """Set up the request to be validated by this policy.
+
+        The policy is then available as `request.openapi_policy`. If early
+        request validation already set up the request, with its own policy,
+        the timings it recorded are kept.
+        """
+        applied = getattr(request, "openapi_policy", None)
+        request.openapi_policy = self
+        environ = request.environ
+
+        # We need this to be able to raise AttributeError if view code
+        # accesses request.openapi_validated on a view that is marked
+        # with openapi=False
+        environ["pyramid_openapi3.enabled"] = True
+
+        # If view is marked with openapi=True (i.e. we are in this
+        # function) and registry settings are not set to disable
+        # validation, then do request/response validation
+        environ["pyramid_openapi3.validate_request"] = self.validate_request
+        environ["pyramid_openapi3.validate_response"] = self.validate_response
+        # Keep the timings of early request validation, if any
+        if self.record_timings and not (applied and applied.record_timings):
+            environ["pyramid_openapi3.timings"] = PhaseTimings()
+        if self.metrics is not None or self.slow_log is not None:
+            environ["pyramid_openapi3.observed"] = True
+            environ["pyramid_openapi3.metrics"] = self.metrics
+            environ["pyramid_openapi3.slow_log"] = self.slow_log
+        if self.metrics is not None and not self.validate_request:
+            self.metrics.skipped(
+                "request",
+                request.matched_route.name,
+                get_api_settings(request)["apiname"],
+            )
+
+
+def get_api_settings(request: Request) -> dict:
+    """Return the settings of the API that the matched route belongs to.
+
+    `check_all_routes` maps every route to its API's settings when the
+    app is created; before that, fall back to looking up the API name.
+    """
+    settings = request.registry.settings
+    route_name = request.matched_route.name
+    api_settings = settings.get("pyramid_openapi3_route_settings", {}).get(route_name)
+    if api_settings is not None:
+        return api_settings
+
+    api_settings = settings["pyramid_openapi3"]
+    route_settings = api_settings.get("routes")
+    if route_settings and route_name in route_settings:
+        api_settings = settings[route_settings[route_name]]
+    return api_settings
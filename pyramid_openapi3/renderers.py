@@ -0,0 +1,37 @@
+"""Renderers whose output is cheaper to validate."""
+
+from .wrappers import RenderedJSON
+from pyramid.interfaces import IRendererInfo
+from pyramid.renderers import JSON
+
+import typing as t
+
+
+class OpenAPIJSON(JSON):
+    """JSON renderer that keeps the rendered object for response validation.
+
+    Registered as the `openapi_json` renderer, serializing with the JSON
+    codec. The object returned by the view is validated against the response
+    schema as is, so that the response tween does not need to parse the JSON
+    it was just serialized to.
+    """
+
+    def __call__(self, info: IRendererInfo) -> t.Callable[[t.Any, dict], bytes]:
+        """Return a renderer for the view, see `pyramid.renderers.JSON`."""
+        render = super().__call__(info)
+
+        def _render(value: t.Any, system: dict) -> bytes:
+            body = render(value, system)
+            request = system.get("request")
+            if request is None:
+                return body if isinstance(body, bytes) else body.encode("UTF-8")
+            if isinstance(body, str):
+                # Encode like `response.text` would, to know the exact body
+                response = request.response
+                body = body.encode(response.charset or response.default_body_encoding)
+            request.environ["pyramid_openapi3.rendered_json"] = RenderedJSON(
+                body, value
+            )
+            return body
+
+        return _render
@@ -0,0 +1,140 @@
+"""Validate responses in background threads, reporting instead of failing."""
+
+from .metrics import MetricsSink
+from .metrics import error_classes
+from .wrappers import OpenAPIRequestSnapshot
+from .wrappers import OpenAPIResponseSnapshot
+
+import logging
+import os
+import queue
+import threading
+import time
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+# The validator, request and response, and the name of the API
+Job = tuple[t.Any, OpenAPIRequestSnapshot, OpenAPIResponseSnapshot, str]
+
+
+class BackgroundResponseValidator:
+    """Run response validation on a bounded pool of daemon threads.
+
+    Jobs are dropped, not queued, when the queue is full, so that
+    validation can never slow down or pile up behind client traffic.
+    Threads are started lazily, and restarted after a fork, so that it is
+    safe to create the validator before a pre-forking server forks.
+
+    Validations are reported to the `metrics` sink, if given, as they
+    finish.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        queue_size: int = 1000,
+        metrics: MetricsSink | None = None,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self.submitted = 0
+        self.dropped = 0
+        self.violations = 0
+        self._lock = threading.Lock()
+        # Counts are updated from request threads and worker threads
+        self._counts_lock = threading.Lock()
+        self._pid: int | None = None
+        self._queue: queue.Queue[Job] = queue.Queue(maxsize=queue_size)
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:  # pragma: no cover
+                return
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            for i in range(self.workers):
+                threading.Thread(
+                    target=self._work,
+                    args=(self._queue,),
+                    name=f"pyramid_openapi3-response-validator-{i}",
+                    daemon=True,
+                ).start()
+            self._pid = pid
+
+    def submit(
+        self,
+        validator: t.Any,
+        request: OpenAPIRequestSnapshot,
+        response: OpenAPIResponseSnapshot,
+        api: str = "pyramid_openapi3",
+    ) -> bool:
+        """Queue a response for validation, return False if it was dropped.
+
+        `api` is the name of the API the response is reported under.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((validator, request, response, api))
+        except queue.Full:
+            with self._counts_lock:
+                self.dropped += 1
+            logger.debug(
+                "Dropped response validation for %s %s, queue is full",
+                request.method.upper(),
+                request.path,
+            )
+            return False
+        with self._counts_lock:
+            self.submitted += 1
+        return True
+
+    def join(self) -> None:
+        """Block until all queued responses have been validated."""
+        self._queue.join()
+
+    def _work(self, jobs: "queue.Queue[Job]") -> None:
+        while True:
+            validator, request, response, api = jobs.get()
+            try:
+                start = time.perf_counter()
+                errors = self.validate(validator, request, response)
+                if self.metrics is not None:
+                    self.metrics.validated(
+                        "response",
+                        request.route_name or "",
+                        api,
+                        time.perf_counter() - start,
+                        error_classes(errors),
+                    )
+            except Exception:
+                logger.exception(
+                    "Response validation for %s %s crashed",
+                    request.method.upper(),
+                    request.path,
+                )
+            finally:
+                jobs.task_done()
+
+    def validate(
+        self,
+        validator: t.Any,
+        request: OpenAPIRequestSnapshot,
+        response: OpenAPIResponseSnapshot,
+    ) -> list[Exception]:
+        """Validate a response and log any violations."""
+        errors = list(validator.iter_errors(request=request, response=response))
+        if errors:
+            with self._counts_lock:
+                self.violations += 1
+            logger.error(
+                "Response validation failed for %s %s (%s): %s",
+                request.method.upper(),
+                request.path,
+                request.route_name,
+                "\n".join(str(e) for e in errors),
+            )
+        return errors
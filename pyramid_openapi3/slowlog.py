@@ -0,0 +1,131 @@
+"""Log validations that take longer than a threshold."""
+
+from contextlib import contextmanager
+from contextlib import nullcontext
+from contextvars import ContextVar
+from jsonschema_path import SchemaPath
+from pyramid.exceptions import ConfigurationError
+from pyramid.request import Request
+
+import logging
+import time
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+_active: ContextVar["SchemaTimings | None"] = ContextVar(
+    "pyramid_openapi3_schema_timings", default=None
+)
+_untimed = nullcontext()
+
+
+def schema_pointer(schema: SchemaPath) -> str:
+    """Return the JSON pointer of a schema in the spec."""
+    return "#/" + "/".join(
+        str(part).replace("~", "~0").replace("/", "~1") for part in schema.parts
+    )
+
+
+class SchemaTimings(dict[str, float]):
+    """Seconds spent validating values against each schema, by JSON pointer."""
+
+    @contextmanager
+    def activate(self) -> t.Generator[None, None, None]:
+        """Record schemas validated via `time_schema` into these timings."""
+        token = _active.set(self)
+        try:
+            yield
+        finally:
+            _active.reset(token)
+
+    @contextmanager
+    def time(self, schema: SchemaPath) -> t.Generator[None, None, None]:
+        """Time validating a value against `schema`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            pointer = schema_pointer(schema)
+            self[pointer] = self.get(pointer, 0.0) + time.perf_counter() - start
+
+    def slowest(self, count: int) -> list[tuple[str, float]]:
+        """Return the `count` schemas that took longest."""
+        return sorted(self.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def time_schema(schema: SchemaPath) -> t.ContextManager[None]:
+    """Time validating a value against `schema` into the active timings, if any."""
+    timings = _active.get()
+    if timings is None:
+        return _untimed
+    return timings.time(schema)
+
+
+def operation_id(request: Request) -> str | None:
+    """Return the operationId of the operation the request was validated against."""
+    found = getattr(request.openapi_request, "path_operation", None)
+    if found is None or "operationId" not in found.operation:
+        return None
+    return (found.operation / "operationId").read_str()
+
+
+class SlowValidationLog:
+    """Log validations taking at least `threshold` seconds as warnings.
+
+    The log says which schemas took longest, so that e.g. a catastrophic
+    `pattern` or a wide `anyOf` can be found and fixed in the spec. These
+    are the top-level schemas of parameters, headers and bodies; a slow
+    subschema is reported as the body (or parameter) schema containing it.
+    """
+
+    def __init__(self, threshold: float, schemas: int = 3) -> None:
+        self.threshold = threshold
+        self.schemas = schemas
+
+    @classmethod
+    def from_settings(
+        cls, settings: t.Mapping[str, t.Any]
+    ) -> "SlowValidationLog | None":
+        """Create the log if `pyramid_openapi3.slow_validation_threshold` is set.
+
+        The threshold is given in milliseconds.
+        """
+        value = settings.get("pyramid_openapi3.slow_validation_threshold")
+        if value is None:
+            return None
+        try:
+            threshold = float(value)
+        except (TypeError, ValueError):
+            threshold = -1.0
+        if threshold < 0:
+            raise ConfigurationError(
+                "pyramid_openapi3.slow_validation_threshold must be a number of "
+                f"milliseconds, got {value!r}"
+            )
+        return cls(threshold / 1000)
+
+    def check(
+        self,
+        kind: str,
+        request: Request,
+        seconds: float,
+        schemas: SchemaTimings,
+        body_size: int | None,
+    ) -> None:
+        """Log the validation if it was slow."""
+        if seconds < self.threshold:
+            return
+        logger.warning(
+            "Slow %s validation for route %s, operation %s: %.1fms, "
+            "body of %s bytes, slowest schemas: %s",
+            kind,
+            request.matched_route.name,
+            operation_id(request),
+            seconds * 1000,
+            "unknown" if body_size is None else body_size,
+            ", ".join(
+                f"{pointer} ({elapsed * 1000:.1f}ms)"
+                for pointer, elapsed in schemas.slowest(self.schemas)
+            )
+            or "none",
+        )
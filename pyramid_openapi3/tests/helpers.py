@@ -0,0 +1,41 @@
+"""Helpers shared between test modules."""
+
+from pyramid.config import Configurator
+from pyramid.request import Request
+from pyramid.router import Router
+from tempfile import NamedTemporaryFile
+from webtest.app import TestApp
+
+import typing as t
+
+
+def make_app(
+    document: bytes,
+    view: t.Callable[[Request], t.Any] | None = None,
+    *,
+    renderer: str = "json",
+    configure: t.Callable[[Configurator], None] | None = None,
+    wrap: t.Callable[[Router], t.Any] | None = None,
+    **settings: t.Any,
+) -> TestApp:
+    """Create an app validating against the given spec document.
+
+    The view, if given, is added as an openapi view of the `foo` route at
+    `/foo`. Other routes and configuration can be added with `configure`,
+    which is called once the spec is added. `wrap` wraps the WSGI app, e.g.
+    in a middleware, before it is passed to the TestApp.
+    """
+    with NamedTemporaryFile() as spec:
+        spec.write(document)
+        spec.seek(0)
+
+        with Configurator(settings=settings) as config:
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(spec.name)
+            if configure is not None:
+                configure(config)
+            if view is not None:
+                config.add_route("foo", "/foo")
+                config.add_view(view, route_name="foo", renderer=renderer, openapi=True)
+            app = config.make_wsgi_app()
+            return TestApp(app if wrap is None else wrap(app))
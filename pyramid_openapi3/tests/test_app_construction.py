@@ -370,6 +370,12 @@ def test_routes_setting_generation(app_config: str, request: SubRequest) -> None
     assert settings["routes"]["create_foo"] == "pyramid_openapi3"
     assert settings["routes"]["bar"] == "pyramid_openapi3"
 
+    # Assert that routes are also mapped directly to their API's settings
+    route_settings = app_config.registry.settings["pyramid_openapi3_route_settings"]
+    assert route_settings["get_foo"] is settings
+    assert route_settings["create_foo"] is settings
+    assert route_settings["bar"] is settings
+
 
 def test_root_server_routes(root_server_app_config: Configurator) -> None:
     """Test case for when you have a server, but with url of /."""
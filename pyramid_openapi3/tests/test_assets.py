@@ -0,0 +1,148 @@
+"""Tests for serving in-memory documents."""
+
+from pathlib import Path
+from pyramid.config import Configurator
+from pyramid.request import Request
+from pyramid_openapi3.assets import ExplorerPage
+from pyramid_openapi3.assets import StaticDocument
+from tempfile import NamedTemporaryFile
+from unittest import mock
+from webtest.app import TestApp
+
+import gzip
+import pytest
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+      description: >
+        Foo API is an API for foos. It lists foos, it shows foos, it
+        creates foos, it updates foos and it deletes foos. Foos are great.
+    paths:
+      /foo:
+        get:
+          responses:
+            200:
+              description: A foo
+"""
+
+
+@pytest.fixture
+def document() -> StaticDocument:
+    """Create a document for tests."""
+    return StaticDocument(DOCUMENT, content_type="text/yaml")
+
+
+def test_identity(document: StaticDocument) -> None:
+    """Clients not sending Accept-Encoding get the document as is."""
+    response = document(Request.blank("/"))
+    assert response.status_code == 200
+    assert response.body == DOCUMENT
+    assert response.content_encoding is None
+    assert response.content_type == "text/yaml"
+    assert response.etag == document.variants["identity"][1]
+    assert response.vary == ("Accept-Encoding",)
+    assert response.cache_control.no_cache is None
+
+
+def test_gzip(document: StaticDocument) -> None:
+    """Clients accepting gzip get the precompressed variant."""
+    request = Request.blank("/", headers={"Accept-Encoding": "gzip, deflate"})
+    response = document(request)
+    assert response.content_encoding == "gzip"
+    assert gzip.decompress(response.body) == DOCUMENT
+    assert response.etag == document.variants["gzip"][1]
+
+    request = Request.blank("/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert document(request).content_encoding is None
+
+    request = Request.blank("/", headers={"Accept-Encoding": "deflate"})
+    assert document(request).content_encoding is None
+
+    # Nothing acceptable, send the document as is rather than a 406
+    request = Request.blank("/", headers={"Accept-Encoding": "identity;q=0, compress"})
+    assert document(request).content_encoding is None
+
+
+def test_not_modified(document: StaticDocument) -> None:
+    """A matching If-None-Match is answered with 304 and no body."""
+    etag = document.variants["identity"][1]
+    request = Request.blank("/", headers={"If-None-Match": f'"{etag}"'})
+    response = document(request)
+    assert response.status_code == 304
+    assert response.etag == etag
+
+    # ETags differ per encoding
+    request = Request.blank(
+        "/", headers={"If-None-Match": f'"{etag}"', "Accept-Encoding": "gzip"}
+    )
+    assert document(request).status_code == 200
+
+
+def test_spec_view_cache_control() -> None:
+    """Spec views are cacheable and honour the configured Cache-Control."""
+    with NamedTemporaryFile() as spec:
+        spec.write(DOCUMENT)
+        spec.seek(0)
+
+        settings = {
+            "pyramid_openapi3.spec_cache_control": "no-cache",
+            "pyramid_openapi3.enable_endpoint_validation": False,
+        }
+        with Configurator(settings=settings) as config:
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(spec.name)
+            app = TestApp(config.make_wsgi_app())
+
+    res = app.get("/openapi.yaml", status=200)
+    assert res.body == DOCUMENT
+    assert res.headers["Content-Type"] == "text/yaml; charset=UTF-8"
+    assert res.headers["Cache-Control"] == "no-cache"
+    app.get("/openapi.yaml", headers={"If-None-Match": res.etag}, status=304)
+
+    res = app.get("/openapi.json", headers={"Accept-Encoding": "gzip"}, status=200)
+    # WebTest decodes the body, dropping Content-Encoding
+    assert res.etag.endswith("-gzip")
+    assert res.json["info"]["title"] == "Foo API"
+    assert res.headers["Cache-Control"] == "no-cache"
+
+
+def test_spec_file_is_read_once() -> None:
+    """The served document is the one that was parsed."""
+    with NamedTemporaryFile() as spec:
+        spec.write(DOCUMENT)
+        spec.seek(0)
+
+        settings = {"pyramid_openapi3.enable_endpoint_validation": False}
+        with (
+            mock.patch.object(
+                Path, "read_bytes", autospec=True, side_effect=Path.read_bytes
+            ) as read_bytes,
+            Configurator(settings=settings) as config,
+        ):
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(spec.name)
+            config.commit()
+
+    assert [call.args[0] for call in read_bytes.call_args_list] == [Path(spec.name)]
+
+
+def test_explorer_page() -> None:
+    """Only the request dependent parts are filled in per request."""
+    page = ExplorerPage(
+        "${ui_version} <script${nonce_attr}>${ui_config} ${oauth_config} $$",
+        ui_version="5.0",
+        ui_config={"deepLinking": False},
+        oauth_config={"clientId": "${ui_config}"},
+    )
+    assert page.render("/openapi.yaml", "http://example.com/redirect") == (
+        '5.0 <script>{"url": "/openapi.yaml", "dom_id": "#swagger-ui", '
+        '"deepLinking": false, "validatorUrl": null, "layout": "StandaloneLayout", '
+        '"oauth2RedirectUrl": "http://example.com/redirect"} '
+        '{"clientId": "${ui_config}"} $'
+    )
+    assert page.render("/a", "/b", nonce="foo").startswith(
+        '5.0 <script nonce="foo">{"url": "/a"'
+    )
@@ -0,0 +1,104 @@
+"""Tests for the pluggable JSON codec."""
+
+from pyramid.exceptions import ConfigurationError
+from pyramid.request import Request
+from pyramid_openapi3.codec import STDLIB
+from pyramid_openapi3.codec import JSONCodec
+from pyramid_openapi3.codec import get_json_codec
+from pyramid_openapi3.tests.helpers import make_app
+from unittest import mock
+
+import json
+import pytest
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  required: [bar]
+                  properties:
+                    bar:
+                      type: string
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: string
+            400:
+              description: Bad request
+"""
+
+
+def _dumps(value: t.Any, **kw: t.Any) -> bytes:
+    """Serialize to bytes, like orjson."""
+    return json.dumps(value, **kw).encode("utf-8")
+
+
+def _foo_view(request: Request) -> t.Any:
+    return request.openapi_validated.body["bar"]
+
+
+def test_resolve() -> None:
+    """Codecs are resolved from modules with dumps and loads."""
+    assert JSONCodec.resolve("json") == JSONCodec(json.dumps, json.loads)
+
+    for name in ("pyramid_openapi3.nonexistent", "typing"):
+        with pytest.raises(ConfigurationError, match="must name a module"):
+            JSONCodec.resolve(name)
+
+
+def test_get_json_codec() -> None:
+    """The codec is resolved once, the standard library's by default."""
+    settings: dict[str, t.Any] = {}
+    assert get_json_codec(settings) is STDLIB
+    assert settings == {"pyramid_openapi3_json_codec": STDLIB}
+
+    settings = {"pyramid_openapi3.json_codec": "json"}
+    codec = get_json_codec(settings)
+    assert codec.dumps is json.dumps
+    assert get_json_codec(settings) is codec
+
+
+def test_encode() -> None:
+    """Codecs returning str or bytes both encode to bytes."""
+    assert STDLIB.encode({"a": ["é"]}) == b'{"a":["\\u00e9"]}'
+    assert JSONCodec(_dumps, json.loads).encode([1, 2]) == b"[1, 2]"
+
+
+def test_codec_is_used() -> None:
+    """The spec, request bodies, errors and rendered objects use the codec."""
+    dumps = mock.Mock(wraps=_dumps)
+    loads = mock.Mock(wraps=json.loads)
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        renderer="openapi_json",
+        pyramid_openapi3_json_codec=JSONCodec(dumps, loads),
+    )
+    res = app.get("/openapi.json", status=200)
+    assert res.json["info"]["title"] == "Foo API"
+    assert dumps.call_count == 1
+
+    res = app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert res.body == b'"baz"'
+    assert loads.call_count == 1
+    assert dumps.call_count == 2
+
+    res = app.post_json("/foo", {}, status=400)
+    assert res.content_type == "application/json"
+    assert res.json[0]["message"] == "'bar' is a required property"
+    assert loads.call_count == 2
+    assert dumps.call_count == 3
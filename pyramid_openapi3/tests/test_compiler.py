@@ -0,0 +1,135 @@
+"""Tests for compiled spec artifacts."""
+
+from pathlib import Path
+from pyramid.config import Configurator
+from pyramid_openapi3.compiler import compile_spec
+from pyramid_openapi3.compiler import load_compiled
+from pyramid_openapi3.compiler import main
+from unittest import mock
+
+import json
+import logging
+import pytest
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        $ref: "paths.yaml#/foo"
+"""
+
+PATHS = b"""
+    foo:
+      get:
+        responses:
+          200:
+            description: A foo
+"""
+
+SINGLE_FILE_DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        get:
+          responses:
+            200:
+              description: A foo
+"""
+
+
+@pytest.fixture
+def spec(tmp_path: Path) -> Path:
+    """Write a spec split across two files."""
+    (tmp_path / "openapi.yaml").write_bytes(DOCUMENT)
+    (tmp_path / "paths.yaml").write_bytes(PATHS)
+    return tmp_path / "openapi.yaml"
+
+
+def test_compile(spec: Path) -> None:
+    """The artifact holds the parsed spec and hashes of all its files."""
+    artifact = compile_spec(spec)
+    assert artifact["format"] == 2
+    assert artifact["root"] == "openapi.yaml"
+    assert sorted(artifact["files"]) == ["openapi.yaml", "paths.yaml"]
+    assert artifact["spec"]["paths"] == {"/foo": {"$ref": "paths.yaml#/foo"}}
+
+
+def test_main(spec: Path) -> None:
+    """The console script writes the artifact next to the spec by default."""
+    assert main([str(spec)]) == 0
+    compiled = spec.with_suffix(".compiled.json")
+    assert json.loads(compiled.read_text()) == compile_spec(spec)
+
+    assert main([str(spec), "-o", str(spec.parent / "foo.json")]) == 0
+    assert (spec.parent / "foo.json").exists()
+
+
+def test_load_compiled(spec: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Stale, missing or incompatible artifacts are ignored."""
+    compiled = spec.with_suffix(".compiled.json")
+    main([str(spec)])
+    assert load_compiled(compiled, spec) == compile_spec(spec)["spec"]
+
+    caplog.set_level(logging.WARNING)
+    with mock.patch("pyramid_openapi3.compiler.ARTIFACT_FORMAT", 3):
+        assert load_compiled(compiled, spec) is None
+    assert "compiled by another version" in caplog.text
+
+    other = spec.with_name("other.yaml")
+    other.write_bytes(SINGLE_FILE_DOCUMENT)
+    assert load_compiled(compiled, other) is None
+    assert "compiled from openapi.yaml, not other.yaml" in caplog.text
+
+    (spec.parent / "paths.yaml").write_bytes(PATHS + b"# changed")
+    assert load_compiled(compiled, spec) is None
+    assert "paths.yaml changed since it was compiled" in caplog.text
+
+    (spec.parent / "paths.yaml").unlink()
+    assert load_compiled(compiled, spec) is None
+
+    compiled.unlink()
+    assert load_compiled(compiled, spec) is None
+
+
+@pytest.mark.parametrize("directive", ["spec", "spec_directory"])
+def test_directives_load_compiled(spec: Path, directive: str) -> None:
+    """The spec directives skip parsing and validation for fresh artifacts."""
+    if directive == "spec":
+        # single file specs can't use relative references
+        spec.write_bytes(SINGLE_FILE_DOCUMENT)
+    compiled = spec.with_suffix(".compiled.json")
+    main([str(spec)])
+
+    with mock.patch("pyramid_openapi3.read_spec") as read:
+        with Configurator() as config:
+            config.include("pyramid_openapi3")
+            getattr(config, f"pyramid_openapi3_{directive}")(
+                str(spec), compiled=str(compiled)
+            )
+            config.commit()
+        read.assert_not_called()
+
+    spec_path = config.registry.settings["pyramid_openapi3"]["spec"]
+    assert (spec_path / "paths" / "/foo" / "get").exists()
+
+
+def test_directive_ignores_stale_artifact(spec: Path) -> None:
+    """A stale artifact falls back to parsing and validating the spec."""
+    compiled = spec.with_suffix(".compiled.json")
+    main([str(spec)])
+    (spec.parent / "paths.yaml").write_bytes(PATHS.replace(b"A foo", b"Foo"))
+
+    with Configurator() as config:
+        config.include("pyramid_openapi3")
+        config.pyramid_openapi3_spec_directory(str(spec), compiled=str(compiled))
+        config.commit()
+
+    spec_path = config.registry.settings["pyramid_openapi3"]["spec"]
+    get = spec_path / "paths" / "/foo" / "get"
+    assert (get / "responses" / "200" / "description").read_value() == "Foo"
@@ -0,0 +1,186 @@
+"""Tests for the radix tree route dispatcher."""
+
+from pyramid.config import Configurator
+from pyramid.exceptions import URLDecodeError
+from pyramid.interfaces import IRoutesMapper
+from pyramid.request import Request
+from pyramid.urldispatch import RoutesMapper
+from pyramid_openapi3.dispatch import RadixRoutesMapper
+from pyramid_openapi3.dispatch import install_radix_mapper
+from tempfile import NamedTemporaryFile
+from types import SimpleNamespace
+from webtest.app import TestApp
+
+import pytest
+import typing as t
+
+ROUTES = [
+    ("root", "/", ()),
+    ("foo_new", "/foo/new", ()),
+    ("foo", "/foo/{foo_id}", ()),
+    ("foo_bar", "/foo/{foo_id}/bar/{bar_id}", ()),
+    ("foo_slash", "/foo/{foo_id}/", ()),
+    ("posted", "/posted/{id}", (lambda info, request: request.method == "POST",)),
+    ("posted_any", "/posted/{id}", ()),
+    ("year", "/archive/{year:\\d{4}}", ()),
+    ("archive", "/archive/{slug}", ()),
+    ("files", "/files/{name}.json", ()),
+    ("static", "/static/*subpath", ()),
+    ("old_style", "/old/:name", ()),
+    ("relative", "relative/{name}", ()),
+    ("bytes", b"/bytes/{name}", ()),
+    ("catchall", "/{everything}", ()),
+]
+
+PATHS = [
+    "",
+    "/",
+    "//",
+    "/foo/new",
+    "/foo/1",
+    "/foo/1/",
+    "/foo/",
+    "/foo//bar/2",
+    "/foo/1/bar/2",
+    "/foo/1/bar/2/",
+    "/posted/1",
+    "/archive/2024",
+    "/archive/hello",
+    "/files/a.json",
+    "/static/css/a.css",
+    "/old/x",
+    "/relative/x",
+    "/bytes/x",
+    "/unknown",
+    "/unknown/deeper",
+    "/foo\n",
+    "/foo/1\n",
+    "/ünïcode",
+]
+
+
+def _mappers() -> tuple[RoutesMapper, RadixRoutesMapper]:
+    mappers = RoutesMapper(), RadixRoutesMapper()
+    for mapper in mappers:
+        for name, pattern, predicates in ROUTES:
+            mapper.connect(name, pattern, predicates=predicates)
+    return mappers
+
+
+def _name(info: dict[str, t.Any]) -> str | None:
+    return info["route"].name if info["route"] else None
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+@pytest.mark.parametrize("path", PATHS)
+def test_same_as_routes_mapper(path: str, method: str) -> None:
+    """Routes are matched like Pyramid's RoutesMapper does."""
+    plain, radix = _mappers()
+    request = SimpleNamespace(path_info=path, method=method)
+    expected, found = plain(request), radix(request)  # ty: ignore[invalid-argument-type]
+    assert _name(found) == _name(expected)
+    assert found["match"] == expected["match"]
+
+
+def test_replaced_route() -> None:
+    """Routes added after a request are dispatched to."""
+    plain, radix = _mappers()
+    request = SimpleNamespace(path_info="/foo/new")
+    assert _name(radix(request)) == "foo_new"  # ty: ignore[invalid-argument-type]
+
+    for mapper in plain, radix:
+        mapper.connect("foo_new", "/foo/new/")
+    assert _name(radix(request)) == _name(plain(request)) == "foo"  # ty: ignore[invalid-argument-type]
+
+
+class _BrokenRequest:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    @property
+    def path_info(self) -> str:
+        raise self.error
+
+
+def test_broken_path_info() -> None:
+    """Missing paths are "/", undecodable paths are errors."""
+    _, radix = _mappers()
+    missing = _BrokenRequest(KeyError())
+    assert _name(radix(missing)) == "root"  # ty: ignore[invalid-argument-type]
+    undecodable = _BrokenRequest(UnicodeDecodeError("utf-8", b"\xff", 0, 1, "bad"))
+    with pytest.raises(URLDecodeError):
+        radix(undecodable)  # ty: ignore[invalid-argument-type]
+
+
+def test_install_radix_mapper() -> None:
+    """Routes added before and after are in the RadixRoutesMapper."""
+    with Configurator() as config:
+        config.add_route("committed", "/committed")
+        config.commit()
+        config.add_route("before", "/before")
+        radix = install_radix_mapper(config)
+        assert install_radix_mapper(config) is radix
+        config.add_route("after", "/after")
+        config.add_static_view("static", "pyramid_openapi3:static")
+        config.commit()
+
+    assert config.registry.getUtility(IRoutesMapper) is radix
+    assert [route.name for route in radix.get_routes(include_static=True)] == [
+        "committed",
+        "before",
+        "after",
+        "__static/",
+    ]
+    request = SimpleNamespace(path_info="/before")
+    assert _name(radix(request)) == "before"
+
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    servers:
+      - url: /api/v1
+    paths:
+      /foo/{foo_id}:
+        x-pyramid-route-name: foo
+        parameters:
+          - name: foo_id
+            in: path
+            required: true
+            schema:
+              type: integer
+        get:
+          responses:
+            200:
+              description: A foo
+            400:
+              description: Bad request
+"""
+
+
+def _foo_view(request: Request) -> int:
+    return request.openapi_validated.parameters.path["foo_id"]
+
+
+def test_register_routes_with_radix_dispatch() -> None:
+    """register_routes can install the RadixRoutesMapper."""
+    with NamedTemporaryFile() as document:
+        document.write(DOCUMENT)
+        document.seek(0)
+
+        with Configurator() as config:
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(document.name)
+            config.pyramid_openapi3_register_routes(
+                route_prefix="/api/v1", radix_dispatch=True
+            )
+            config.add_view(_foo_view, route_name="foo", renderer="json", openapi=True)
+            app = TestApp(config.make_wsgi_app())
+
+    assert isinstance(config.registry.getUtility(IRoutesMapper), RadixRoutesMapper)
+    assert app.get("/api/v1/foo/1", status=200).json == 1
+    app.get("/api/v1/foo/bar", status=400)
+    app.get("/openapi.yaml", status=200)
+    app.get("/foo/1", status=404)
@@ -0,0 +1,205 @@
+"""Tests for early request validation."""
+
+from pyramid.authentication import RemoteUserAuthenticationPolicy
+from pyramid.config import Configurator
+from pyramid.request import Request
+from pyramid_openapi3.tests.helpers import make_app
+from pyramid_openapi3.validators import V31RequestUnmarshaller
+from unittest import mock
+
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  required: [bar]
+                  properties:
+                    bar:
+                      type: string
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: string
+            400:
+              description: Bad request
+      /plain:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  required: [bar]
+          responses:
+            200:
+              description: Not validated
+"""
+
+
+class Recorder:
+    """Root factory and authorization policy that remember being called."""
+
+    calls: t.ClassVar[list[str]] = []
+
+    def __init__(self, request: Request | None) -> None:
+        self.calls.append("root_factory")
+
+    def permits(self, context: t.Any, principals: t.Any, permission: str) -> bool:
+        """Allow everything."""
+        self.calls.append("permits")
+        return True
+
+
+def _foo_view(request: Request) -> t.Any:
+    return request.openapi_json_body["bar"]
+
+
+def _plain_view(request: Request) -> t.Any:
+    return "plain"
+
+
+def _configure(config: Configurator) -> None:
+    config.set_authentication_policy(RemoteUserAuthenticationPolicy())
+    config.set_authorization_policy(Recorder(None))
+    config.add_route("foo", "/foo", factory=Recorder)
+    config.add_view(
+        _foo_view,
+        route_name="foo",
+        renderer="json",
+        openapi=True,
+        permission="view",
+    )
+    config.add_view(
+        _foo_view,
+        route_name="foo",
+        renderer="json",
+        openapi=True,
+        request_method="PUT",
+    )
+    config.add_route("plain", "/plain", factory=Recorder)
+    config.add_view(_plain_view, route_name="plain", renderer="json")
+
+
+def _settings(**settings: t.Any) -> dict[str, t.Any]:
+    return {"pyramid_openapi3.early_request_validation": "true", **settings}
+
+
+def test_invalid_requests_are_rejected_early() -> None:
+    """Invalid requests don't get to the root factory or permission check."""
+    app = make_app(DOCUMENT, configure=_configure, **_settings())
+    Recorder.calls = []
+    res = app.post_json("/foo", {}, status=400)
+    assert res.json[0]["message"] == "'bar' is a required property"
+    assert Recorder.calls == []
+
+
+def test_valid_requests_are_validated_once() -> None:
+    """The view gets the result of early validation."""
+    app = make_app(DOCUMENT, configure=_configure, **_settings())
+    Recorder.calls = []
+    with mock.patch.object(
+        V31RequestUnmarshaller,
+        "unmarshal",
+        autospec=True,
+        side_effect=V31RequestUnmarshaller.unmarshal,
+    ) as unmarshal:
+        res = app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert res.json == "baz"
+    assert Recorder.calls == ["root_factory", "permits"]
+    unmarshal.assert_called_once()
+
+
+def test_without_early_validation() -> None:
+    """By default, requests are validated in the view."""
+    app = make_app(DOCUMENT, configure=_configure)
+    Recorder.calls = []
+    app.post_json("/foo", {}, status=400)
+    assert Recorder.calls == ["root_factory", "permits"]
+
+
+def test_other_requests_are_left_to_the_view() -> None:
+    """Views that don't validate and operations not in the spec are skipped."""
+    app = make_app(DOCUMENT, configure=_configure, **_settings())
+    Recorder.calls = []
+    assert app.post_json("/plain", {}, status=200).json == "plain"
+    # The view rejects the request, and then its own response, as PUT isn't in the spec
+    app.put_json("/foo", {}, status=500)
+    app.get("/unknown", status=404)
+    assert Recorder.calls == ["root_factory", "root_factory"]
+
+
+def test_request_validation_disabled() -> None:
+    """Nothing is validated early if request validation is disabled."""
+    app = make_app(
+        DOCUMENT,
+        configure=_configure,
+        **_settings(**{"pyramid_openapi3.enable_request_validation": "false"}),
+    )
+    Recorder.calls = []
+    app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert Recorder.calls == ["root_factory", "permits"]
+
+
+def test_endpoint_validation_disabled() -> None:
+    """Routes are only known once check_all_routes has mapped them to specs."""
+    app = make_app(
+        DOCUMENT,
+        configure=_configure,
+        **_settings(**{"pyramid_openapi3.enable_endpoint_validation": False}),
+    )
+    Recorder.calls = []
+    app.post_json("/foo", {}, status=400)
+    assert Recorder.calls == ["root_factory", "permits"]
+
+
+def test_settings_changed_after_include() -> None:
+    """Settings changed after including pyramid_openapi3 are honoured."""
+
+    def configure(config: Configurator) -> None:
+        settings = config.registry.settings
+        settings["pyramid_openapi3.enable_request_validation"] = False
+        settings["pyramid_openapi3.enable_response_validation"] = False
+        _configure(config)
+
+    app = make_app(DOCUMENT, configure=configure, **_settings())
+    Recorder.calls = []
+    assert app.post_json("/foo", {"bar": 1}, status=200).json == 1
+    assert Recorder.calls == ["root_factory", "permits"]
+
+
+def test_metrics_and_timings() -> None:
+    """Early validation reports to the metrics sink and keeps its timings."""
+
+    def configure(config: Configurator) -> None:
+        config.pyramid_openapi3_add_metrics_view()
+        _configure(config)
+
+    app = make_app(
+        DOCUMENT,
+        configure=configure,
+        **_settings(**{"pyramid_openapi3.server_timing": True}),
+    )
+    res = app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert "body;dur=" in res.headers["Server-Timing"]
+
+    metrics = app.get("/metrics", status=200).text
+    for kind in ("request", "response"):
+        assert (
+            "pyramid_openapi3_validations_total"
+            f'{{kind="{kind}",route="foo",api="pyramid_openapi3"}} 1' in metrics
+        )
@@ -0,0 +1,275 @@
+"""Tests for the route -> operation index."""
+
+from jsonschema_path import SchemaPath
+from openapi_core.datatypes import Parameters
+from openapi_core.templating.paths.finders import APICallPathFinder
+from openapi_core.testing import MockRequest
+from openapi_core.unmarshalling.request.datatypes import RequestUnmarshalResult
+from pyramid.config import Configurator
+from pyramid.events import ApplicationCreated
+from pyramid.registry import Registry
+from pyramid.request import Request
+from pyramid.urldispatch import RoutesMapper
+from pyramid_openapi3 import check_all_routes
+from pyramid_openapi3.exceptions import ImproperAPISpecificationWarning
+from pyramid_openapi3.index import OperationIndex
+from pyramid_openapi3.index import PrefixTrie
+from pyramid_openapi3.loaders import parse_spec
+from pyramid_openapi3.validators import V31RequestUnmarshaller
+from pyramid_openapi3.wrappers import PyramidOpenAPIRequest
+from tempfile import NamedTemporaryFile
+from types import SimpleNamespace
+from unittest import mock
+from webtest.app import TestApp
+
+import pytest
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    servers:
+      - url: /api/v1
+    paths:
+      /foo/{foo_id}:
+        parameters:
+          - name: foo_id
+            in: path
+            required: true
+            schema:
+              type: integer
+        get:
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: integer
+            400:
+              description: Bad Request
+        post:
+          responses:
+            200:
+              description: A POST foo
+"""
+
+HEALTH_PATH = b"""
+      /health:
+        get:
+          responses:
+            200:
+              description: Healthy
+"""
+
+
+def _foo_view(request: Request) -> int:
+    return request.openapi_validated.parameters.path["foo_id"]
+
+
+@pytest.fixture
+def app() -> t.Generator[TestApp, None, None]:
+    """Create a test app with an indexed route."""
+    with NamedTemporaryFile() as document:
+        document.write(DOCUMENT)
+        document.seek(0)
+
+        with Configurator() as config:
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(document.name)
+            config.add_route("foo_route", "/api/v1/foo/{foo_id}")
+            config.add_view(
+                _foo_view, route_name="foo_route", renderer="json", openapi=True
+            )
+            yield TestApp(config.make_wsgi_app())
+
+
+def test_index_is_built(app: TestApp) -> None:
+    """All operations of matched routes are indexed at app creation."""
+    index = app.app.registry.settings["pyramid_openapi3"]["operation_index"]
+    assert len(index) == 2
+    assert index.get("foo_route", "get") is not None
+    assert index.get("foo_route", "post") is not None
+    assert index.get("foo_route", "put") is None
+
+
+def test_validation_skips_path_finding(app: TestApp) -> None:
+    """Indexed routes are validated without scanning the spec's paths."""
+    with mock.patch.object(
+        APICallPathFinder, "find", side_effect=AssertionError("unexpected")
+    ):
+        assert app.get("/api/v1/foo/1").json == 1
+        res = app.get("/api/v1/foo/bar", status=400)
+    assert res.json[0]["field"] == "foo_id"
+
+
+def test_unknown_server(app: TestApp) -> None:
+    """Server matching still happens for indexed routes."""
+    with pytest.warns(ImproperAPISpecificationWarning):
+        res = app.get("/api/v1/foo/1", extra_environ={"SCRIPT_NAME": "/x"}, status=500)
+    assert res.json == [
+        {
+            "exception": "ServerNotFound",
+            "message": "Server not found for http://localhost/x/api/v1/foo/{foo_id}",
+        }
+    ]
+
+
+def test_unindexed_method_falls_back(app: TestApp) -> None:
+    """Methods not in the spec fall back to openapi-core's path finder."""
+    with pytest.warns(ImproperAPISpecificationWarning):
+        res = app.put("/api/v1/foo/1", status=500)
+    assert res.json[0]["exception"] == "OperationNotFound"
+
+
+def test_operation_resolved_once(app: TestApp) -> None:
+    """Request and response validation share one adapter and operation."""
+    adapters = []
+
+    def find(self: OperationIndex, request: t.Any, *args: t.Any) -> t.Any:
+        adapters.append(request)
+        return original_find(self, request, *args)
+
+    original_find = OperationIndex.find
+    with mock.patch.object(OperationIndex, "find", find):
+        assert app.get("/api/v1/foo/1").json == 1
+
+    assert len(adapters) == 1
+    assert isinstance(adapters[0], PyramidOpenAPIRequest)
+    assert adapters[0].path_operation.path_result.pattern == "/foo/{foo_id}"
+
+
+def test_validator_without_index() -> None:
+    """Validators work without an index and with other request types."""
+    spec = SchemaPath.from_dict(parse_spec(DOCUMENT, "openapi.yaml"))
+    request = MockRequest("http://localhost", "get", "/api/v1/foo/1")
+    result = V31RequestUnmarshaller(spec).unmarshal(request)
+    assert result.errors == []
+    assert result.parameters.path == {"foo_id": 1}
+
+
+def test_empty_operations() -> None:
+    """Operations without parameters, body and security have nothing to validate."""
+    parameters = [{"name": "q", "in": "query", "schema": {"type": "string"}}]
+    spec = SchemaPath.from_dict(
+        {
+            "security": [{"key": []}],
+            "paths": {
+                "/a": {
+                    "get": {"security": []},
+                    "post": {},
+                    "put": {"security": [], "requestBody": {"content": {}}},
+                    "delete": {"security": [], "parameters": parameters},
+                },
+                "/b": {"parameters": parameters, "get": {"security": []}},
+            },
+        }
+    )
+    index = OperationIndex(spec)
+    index.add("a", "/a")
+    index.add("b", "/b")
+    assert index.is_empty("a", "get")
+    assert not index.is_empty("a", "post")
+    assert not index.is_empty("a", "put")
+    assert not index.is_empty("a", "delete")
+    assert not index.is_empty("b", "get")
+    assert not index.is_empty(None, "get")
+
+
+def test_empty_operation_is_not_unmarshalled() -> None:
+    """Requests to operations with nothing to validate get an empty result."""
+    results = []
+
+    def health(request: Request) -> str:
+        results.append(request.openapi_validated)
+        return "OK"
+
+    with NamedTemporaryFile() as document:
+        document.write(DOCUMENT + HEALTH_PATH)
+        document.seek(0)
+
+        with Configurator() as config:
+            config.include("pyramid_openapi3")
+            config.pyramid_openapi3_spec(document.name)
+            config.add_route("foo_route", "/api/v1/foo/{foo_id}")
+            config.add_route("health", "/api/v1/health")
+            config.add_view(health, route_name="health", renderer="json", openapi=True)
+            app = TestApp(config.make_wsgi_app())
+
+    with mock.patch.object(
+        V31RequestUnmarshaller, "_unmarshal", side_effect=AssertionError("unexpected")
+    ):
+        app.get("/api/v1/health?unknown=1", status=200)
+        app.get("/api/v1/health", status=200)
+        with pytest.warns(ImproperAPISpecificationWarning):
+            res = app.get(
+                "/api/v1/health", extra_environ={"SCRIPT_NAME": "/x"}, status=500
+            )
+    assert (
+        results
+        == [RequestUnmarshalResult(errors=[], parameters=Parameters(), security={})] * 2
+    )
+    assert results[0] is not results[1]
+    assert results[0].errors is not results[1].errors
+    assert res.json[0]["exception"] == "ServerNotFound"
+
+
+def test_prefix_trie() -> None:
+    """Prefixes match whole segments, and the first listed prefix wins."""
+    trie = PrefixTrie(["/api", "/api/v1", "/v", "/api"])
+    assert trie.remove_prefix("/api/v1/foo") == "/v1/foo"
+    assert trie.remove_prefix("/api") == "/"
+    assert trie.remove_prefix("v/foo") == "/foo"
+    assert trie.remove_prefix("/version") == "/version"
+    assert trie.remove_prefix("/apidocs/foo") == "/apidocs/foo"
+
+    trie = PrefixTrie(["/api/v1", "/api"])
+    assert trie.remove_prefix("/api/v1/foo") == "/foo"
+    assert trie.remove_prefix("/api/v2/foo") == "/v2/foo"
+    assert PrefixTrie().remove_prefix("/foo") == "/foo"
+
+
+def _check_routes(count: int) -> dict[str, int]:
+    """Count the work check_all_routes does for `count` paths and routes."""
+    paths = {
+        f"/foo{i}/{{foo_id}}": {"get": {"responses": {"200": {"description": "A"}}}}
+        for i in range(count)
+    }
+    spec = SchemaPath.from_dict(
+        {"openapi": "3.1.0", "servers": [{"url": "/api/v1"}], "paths": paths}
+    )
+    mapper = RoutesMapper()
+    for i, path in enumerate(paths):
+        mapper.connect(f"foo{i}", f"/api/v1{path}")
+    registry = Registry()
+    registry.settings = {
+        "pyramid_openapi3_apinames": ["pyramid_openapi3"],
+        "pyramid_openapi3": {"spec": spec, "operation_index": OperationIndex(spec)},
+    }
+    event = ApplicationCreated(SimpleNamespace(registry=registry, routes_mapper=mapper))
+
+    with (
+        mock.patch.object(
+            PrefixTrie,
+            "remove_prefix",
+            autospec=True,
+            side_effect=PrefixTrie.remove_prefix,
+        ) as remove_prefix,
+        mock.patch.object(
+            OperationIndex, "add", autospec=True, side_effect=OperationIndex.add
+        ) as add,
+    ):
+        check_all_routes(event)
+    assert len(registry.settings["pyramid_openapi3_route_settings"]) == count
+    return {"prefixes": remove_prefix.call_count, "indexed": add.call_count}
+
+
+def test_check_all_routes_scales_linearly() -> None:
+    """Each route has its prefix removed and is indexed once.
+
+    See `python -m benchmarks.scale` for timings as a function of spec size.
+    """
+    assert _check_routes(10) == {"prefixes": 10, "indexed": 10}
+    assert _check_routes(1000) == {"prefixes": 1000, "indexed": 1000}
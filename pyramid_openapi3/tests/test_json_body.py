@@ -0,0 +1,118 @@
+"""Tests for sharing the JSON request body parsed during validation."""
+
+from jsonschema_path import SchemaPath
+from openapi_core.testing import MockRequest
+from pyramid.request import Request
+from pyramid_openapi3.loaders import parse_spec
+from pyramid_openapi3.tests.helpers import make_app
+from pyramid_openapi3.validators import V31RequestUnmarshaller
+from pyramid_openapi3.validators import is_json
+from pyramid_openapi3.wrappers import UNPARSED
+from unittest import mock
+
+import json
+import pytest
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        post:
+          parameters:
+            - name: filter
+              in: query
+              content:
+                application/json:
+                  schema:
+                    type: object
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    bar:
+                      type: string
+              application/x-www-form-urlencoded:
+                schema:
+                  type: object
+          responses:
+            200:
+              description: A foo
+"""
+
+
+def _foo_view(request: Request) -> t.Any:
+    parsed = request.openapi_request.json_body
+    return {
+        "parsed": parsed if parsed is not UNPARSED else None,
+        "json_body": request.openapi_json_body
+        if request.content_type == "application/json"
+        else None,
+    }
+
+
+@pytest.mark.parametrize(
+    "mimetype, expected",
+    [
+        ("application/json", True),
+        ("application/vnd.api+json", True),
+        ("application/x-www-form-urlencoded", False),
+        ("text/plain", False),
+    ],
+)
+def test_is_json(mimetype: str, expected: bool) -> None:
+    """JSON based formats count as JSON."""
+    assert is_json(mimetype) is expected
+
+
+def test_json_body_is_parsed_once() -> None:
+    """The view gets the body deserialized during validation."""
+    app = make_app(DOCUMENT, _foo_view)
+    with mock.patch(
+        "pyramid.request.Request.json_body", new_callable=mock.PropertyMock
+    ) as json_body:
+        res = app.post_json("/foo", {"bar": "baz"}, status=200)
+    json_body.assert_not_called()
+    assert res.json == {"parsed": {"bar": "baz"}, "json_body": {"bar": "baz"}}
+
+
+def test_query_parameter_content_is_not_kept() -> None:
+    """Parameters with JSON content are not mistaken for the body."""
+    app = make_app(DOCUMENT, _foo_view)
+    res = app.post(
+        "/foo?filter=" + json.dumps({"a": 1}),
+        "a=b",
+        content_type="application/x-www-form-urlencoded",
+        status=200,
+    )
+    assert res.json == {"parsed": None, "json_body": None}
+
+
+def test_json_body_without_request_validation() -> None:
+    """The body is parsed on access when request validation is disabled."""
+    app = make_app(
+        DOCUMENT, _foo_view, **{"pyramid_openapi3.enable_request_validation": False}
+    )
+    res = app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert res.json == {"parsed": None, "json_body": {"bar": "baz"}}
+
+
+def test_other_requests_are_unmarshalled() -> None:
+    """Requests that are not PyramidOpenAPIRequests are still unmarshalled."""
+    spec = SchemaPath.from_dict(parse_spec(DOCUMENT, "openapi.yaml"))
+    request = MockRequest(
+        "http://localhost",
+        "post",
+        "/foo",
+        data=b'{"bar": "baz"}',
+        content_type="application/json",
+    )
+    result = V31RequestUnmarshaller(spec).unmarshal(request)
+    assert result.errors == []
+    assert result.body == {"bar": "baz"}
@@ -0,0 +1,58 @@
+"""Tests for parsing spec files."""
+
+from openapi_spec_validator.readers import read_from_filename
+from pathlib import Path
+from pyramid_openapi3.loaders import YAML_LOADER
+from pyramid_openapi3.loaders import read_spec
+from unittest import mock
+
+import json
+import logging
+import pytest
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        get:
+          parameters:
+            - name: since
+              in: query
+              schema:
+                type: string
+                example: 2001-12-14
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: number
+                    example: 1e3
+"""
+
+
+def test_yaml(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """YAML specs are parsed the same way as openapi-spec-validator does."""
+    spec = tmp_path / "openapi.yaml"
+    spec.write_bytes(DOCUMENT)
+
+    caplog.set_level(logging.INFO)
+    assert read_spec(spec) == read_from_filename(str(spec))[0]
+    assert f"Parsed {spec} with {YAML_LOADER}" in caplog.text
+    assert YAML_LOADER in {"libyaml", "pure Python YAML"}
+
+
+def test_json(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """JSON specs are parsed with the stdlib JSON parser."""
+    spec = tmp_path / "openapi.json"
+    spec.write_text(json.dumps({"openapi": "3.1.0", "paths": {}}))
+
+    caplog.set_level(logging.INFO)
+    with mock.patch("pyramid_openapi3.loaders.file_handler") as file_handler:
+        assert read_spec(spec) == {"openapi": "3.1.0", "paths": {}}
+        file_handler.assert_not_called()
+    assert f"Parsed {spec} with json" in caplog.text
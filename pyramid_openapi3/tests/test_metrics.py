@@ -0,0 +1,277 @@
+"""Tests for validation metrics."""
+
+from pyramid.config import Configurator
+from pyramid.exceptions import ConfigurationError
+from pyramid.request import Request
+from pyramid_openapi3.metrics import MetricsRegistry
+from pyramid_openapi3.metrics import get_metrics
+from pyramid_openapi3.tests.helpers import make_app
+
+import pytest
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  required: [bar]
+                  properties:
+                    bar:
+                      type: string
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: string
+            400:
+              description: Bad request
+"""
+
+
+class RecordingSink:
+    """A metrics sink remembering what it was told."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple] = []
+
+    def validated(
+        self,
+        kind: str,
+        route: str,
+        api: str,
+        seconds: float,
+        failures: t.Collection[str],
+    ) -> None:
+        """Remember a validation."""
+        assert seconds >= 0
+        self.events.append(("validated", kind, route, api, sorted(failures)))
+
+    def skipped(self, kind: str, route: str, api: str) -> None:
+        """Remember a skipped validation."""
+        self.events.append(("skipped", kind, route, api))
+
+
+def _foo_view(request: Request) -> t.Any:
+    if "respond" in request.GET:
+        return int(request.GET["respond"])
+    return request.openapi_validated.body["bar"]
+
+
+def test_registry_render() -> None:
+    """Metrics are rendered in the Prometheus text format."""
+    registry = MetricsRegistry(buckets=(0.1, 0.01))
+    registry.validated("request", "foo", "api", 0.005, [])
+    registry.validated("request", "foo", "api", 0.05, ["ValidationError"])
+    registry.validated("request", "foo", "api", 2.0, ["ValidationError"])
+    registry.skipped("response", 'say "hi"\\\n', "api")
+
+    assert registry.render() == (
+        "# HELP pyramid_openapi3_validations_total "
+        "Validations of requests and responses.\n"
+        "# TYPE pyramid_openapi3_validations_total counter\n"
+        'pyramid_openapi3_validations_total{kind="request",route="foo",api="api"} 3\n'
+        "# HELP pyramid_openapi3_validations_skipped_total "
+        "Validations that were disabled or not sampled.\n"
+        "# TYPE pyramid_openapi3_validations_skipped_total counter\n"
+        "pyramid_openapi3_validations_skipped_total"
+        '{kind="response",route="say \\"hi\\"\\\\\\n",api="api"} 1\n'
+        "# HELP pyramid_openapi3_validation_failures_total "
+        "Failed validations, by exception class.\n"
+        "# TYPE pyramid_openapi3_validation_failures_total counter\n"
+        "pyramid_openapi3_validation_failures_total"
+        '{kind="request",route="foo",api="api",exception="ValidationError"} 2\n'
+        "# HELP pyramid_openapi3_validation_duration_seconds Time spent validating.\n"
+        "# TYPE pyramid_openapi3_validation_duration_seconds histogram\n"
+        "pyramid_openapi3_validation_duration_seconds_bucket"
+        '{kind="request",route="foo",api="api",le="0.01"} 1\n'
+        "pyramid_openapi3_validation_duration_seconds_bucket"
+        '{kind="request",route="foo",api="api",le="0.1"} 2\n'
+        "pyramid_openapi3_validation_duration_seconds_bucket"
+        '{kind="request",route="foo",api="api",le="+Inf"} 3\n'
+        "pyramid_openapi3_validation_duration_seconds_sum"
+        '{kind="request",route="foo",api="api"} 2.055\n'
+        "pyramid_openapi3_validation_duration_seconds_count"
+        '{kind="request",route="foo",api="api"} 3\n'
+    )
+
+
+def test_get_metrics() -> None:
+    """A registry is only created when metrics are enabled."""
+    settings: dict[str, t.Any] = {}
+    assert get_metrics(settings) is None
+    assert settings == {}
+
+    settings["pyramid_openapi3.metrics"] = "true"
+    registry = get_metrics(settings)
+    assert isinstance(registry, MetricsRegistry)
+    assert get_metrics(settings) is registry
+
+    sink = RecordingSink()
+    assert get_metrics({"pyramid_openapi3_metrics": sink}) is sink
+
+
+def test_validations_are_recorded() -> None:
+    """Validations and their failures are reported to the sink."""
+    sink = RecordingSink()
+    app = make_app(DOCUMENT, _foo_view, pyramid_openapi3_metrics=sink)
+
+    app.post_json("/foo", {"bar": "baz"}, status=200)
+    app.post_json("/foo", {}, status=400)
+    app.post_json("/foo?respond=1", {"bar": "baz"}, status=500)
+
+    api = ("foo", "pyramid_openapi3")
+    assert sink.events == [
+        ("validated", "request", *api, []),
+        ("validated", "response", *api, []),
+        ("validated", "request", *api, ["ValidationError"]),
+        ("validated", "response", *api, []),
+        ("validated", "request", *api, []),
+        ("validated", "response", *api, ["ValidationError"]),
+    ]
+
+
+def test_custom_extract_errors() -> None:
+    """Failures are classified by the configured extract_errors, called once."""
+    calls = []
+
+    def extract_errors(request: Request, errors: list[Exception]) -> t.Iterator[dict]:
+        calls.append(errors)
+        for error in errors:
+            yield {"exception": f"Custom{type(error).__name__}", "message": "Oops"}
+
+    sink = RecordingSink()
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        pyramid_openapi3_metrics=sink,
+        pyramid_openapi3_extract_errors=extract_errors,
+    )
+    res = app.post_json("/foo", {}, status=400)
+
+    assert res.json == [{"exception": "CustomInvalidRequestBody", "message": "Oops"}]
+    assert sink.events[0] == (
+        "validated",
+        "request",
+        "foo",
+        "pyramid_openapi3",
+        ["CustomInvalidRequestBody"],
+    )
+    assert len(calls) == 1
+
+
+def test_extract_errors_without_exception() -> None:
+    """Failures are classified by the raw errors if extract_errors hides them."""
+
+    def extract_errors(request: Request, errors: list[Exception]) -> t.Iterator[dict]:
+        for _ in errors:
+            yield {"message": "Oops"}
+
+    sink = RecordingSink()
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        pyramid_openapi3_metrics=sink,
+        pyramid_openapi3_extract_errors=extract_errors,
+    )
+    res = app.post_json("/foo", {}, status=400)
+
+    assert res.json == [{"message": "Oops"}]
+    assert sink.events[0][-1] == ["InvalidRequestBody"]
+
+
+def test_unsampled_response_validation_is_recorded() -> None:
+    """Response validations that were not sampled are counted as skipped."""
+    sink = RecordingSink()
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        pyramid_openapi3_metrics=sink,
+        **{"pyramid_openapi3.response_validation_sample_rate": 0},
+    )
+    app.post_json("/foo", {"bar": "baz"}, status=200)
+
+    api = ("foo", "pyramid_openapi3")
+    assert sink.events == [
+        ("validated", "request", *api, []),
+        ("skipped", "response", *api),
+    ]
+
+
+def test_disabled_validations_are_recorded() -> None:
+    """Disabled validations are counted as skipped."""
+    sink = RecordingSink()
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        pyramid_openapi3_metrics=sink,
+        **{
+            "pyramid_openapi3.enable_request_validation": False,
+            "pyramid_openapi3.enable_response_validation": False,
+        },
+    )
+    app.post_json("/foo?respond=1", {"bar": "baz"}, status=200)
+
+    api = ("foo", "pyramid_openapi3")
+    assert sink.events == [("skipped", "request", *api), ("skipped", "response", *api)]
+
+
+def test_background_validations_are_recorded() -> None:
+    """Report-only response validations are recorded once they are done."""
+    sink = RecordingSink()
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        pyramid_openapi3_metrics=sink,
+        **{"pyramid_openapi3.response_validation_mode": "report"},
+    )
+    reporter = app.app.registry.settings["pyramid_openapi3_response_reporter"]
+    app.post_json("/foo", {"bar": "baz"}, status=200)
+    reporter.join()
+    app.post_json("/foo?respond=1", {"bar": "baz"}, status=200)
+    reporter.join()
+
+    api = ("foo", "pyramid_openapi3")
+    assert sink.events == [
+        ("validated", "request", *api, []),
+        ("validated", "response", *api, []),
+        ("validated", "request", *api, []),
+        ("validated", "response", *api, ["ValidationError"]),
+    ]
+
+
+def test_metrics_view() -> None:
+    """The metrics view enables metrics and renders them."""
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        configure=lambda config: config.pyramid_openapi3_add_metrics_view(),
+    )
+    app.post_json("/foo", {}, status=400)
+
+    res = app.get("/metrics", status=200)
+    assert res.headers["Content-Type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert (
+        "pyramid_openapi3_validation_failures_total"
+        '{kind="request",route="foo",api="pyramid_openapi3",exception="ValidationError"} 1'
+        in res.text
+    )
+
+
+def test_metrics_view_needs_registry() -> None:
+    """The metrics view can't render other sinks."""
+    with Configurator(settings={"pyramid_openapi3_metrics": RecordingSink()}) as config:
+        config.include("pyramid_openapi3")
+        with pytest.raises(ConfigurationError, match="built-in MetricsRegistry"):
+            config.pyramid_openapi3_add_metrics_view()
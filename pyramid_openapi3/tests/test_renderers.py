@@ -0,0 +1,126 @@
+"""Tests for the openapi_json renderer."""
+
+from pyramid.config import Configurator
+from pyramid.registry import Registry
+from pyramid.request import Request
+from pyramid.response import Response
+from pyramid_openapi3.renderers import OpenAPIJSON
+from pyramid_openapi3.tests.helpers import make_app
+from unittest import mock
+from webtest.app import TestApp
+
+import json
+import pytest
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        get:
+          parameters:
+            - name: respond
+              in: query
+              schema:
+                type: string
+          responses:
+            200:
+              description: A list of foos
+              content:
+                application/json:
+                  schema:
+                    type: array
+                    items:
+                      type: string
+"""
+
+RESPONSES: dict[str, t.Any] = {
+    "valid": ["föö", "bar"],
+    "invalid": [1, 2],
+    "tuple": ("foo", "bar"),
+}
+
+
+def change_body_tween_factory(
+    handler: t.Callable[[Request], Response], registry: Registry
+) -> t.Callable[[Request], Response]:
+    """Change the body after rendering, before response validation."""
+
+    def tween(request: Request) -> Response:
+        response = handler(request)
+        if request.GET["respond"] == "replaced":
+            response.body = b"[3]"
+        if request.GET["respond"] == "streamed":
+            response.app_iter = iter([b"[3]"])
+        return response
+
+    return tween
+
+
+def _change_body(config: Configurator) -> None:
+    config.add_tween(
+        "pyramid_openapi3.tests.test_renderers.change_body_tween_factory",
+        under="pyramid_openapi3.tween.response_tween_factory",
+    )
+
+
+def _foo_view(request: Request) -> t.Any:
+    return RESPONSES.get(request.GET["respond"], [])
+
+
+def _json_loads() -> t.Any:
+    return mock.patch(
+        "openapi_core.deserializing.media_types.util.loads", wraps=json.loads
+    )
+
+
+@pytest.fixture
+def app() -> TestApp:
+    """Create a test app rendering with the openapi_json renderer."""
+    return make_app(
+        DOCUMENT, _foo_view, renderer="openapi_json", configure=_change_body
+    )
+
+
+def test_render_without_request() -> None:
+    """The renderer works like the json renderer."""
+    render = OpenAPIJSON()(mock.Mock())
+    assert render({"a": "ö"}, {}) == b'{"a": "\\u00f6"}'
+
+
+def test_rendered_object_is_validated(app: TestApp) -> None:
+    """The rendered object is validated instead of the parsed body."""
+    with _json_loads() as loads:
+        res = app.get("/foo", {"respond": "valid"}, status=200)
+    loads.assert_not_called()
+    assert res.content_type == "application/json"
+    assert res.json == ["föö", "bar"]
+
+
+def test_invalid_object(app: TestApp) -> None:
+    """Invalid objects fail response validation."""
+    res = app.get("/foo", {"respond": "invalid"}, status=500)
+    assert res.json[0]["message"] == "1 is not of type 'string'"
+
+
+def test_object_differing_from_json(app: TestApp) -> None:
+    """Objects are rechecked as JSON before failing validation."""
+    with _json_loads() as loads:
+        res = app.get("/foo", {"respond": "tuple"}, status=200)
+    loads.assert_called_once()
+    assert res.json == ["foo", "bar"]
+
+
+def test_replaced_body(app: TestApp) -> None:
+    """A body replaced after rendering is validated as is."""
+    res = app.get("/foo", {"respond": "replaced"}, status=500)
+    assert res.json[0]["message"] == "3 is not of type 'string'"
+
+
+def test_streamed_body(app: TestApp) -> None:
+    """A body streamed after rendering is not read."""
+    res = app.get("/foo", {"respond": "streamed"}, status=200)
+    assert res.body == b"[3]"
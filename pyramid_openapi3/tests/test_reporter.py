@@ -0,0 +1,165 @@
+"""Tests for report-only, background response validation."""
+
+from pyramid.exceptions import ConfigurationError
+from pyramid.request import Request
+from pyramid_openapi3.reporter import BackgroundResponseValidator
+from pyramid_openapi3.tests.helpers import make_app
+from pyramid_openapi3.wrappers import OpenAPIRequestSnapshot
+from pyramid_openapi3.wrappers import OpenAPIResponseSnapshot
+
+import logging
+import pytest
+import threading
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        get:
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: integer
+"""
+
+REQUEST = OpenAPIRequestSnapshot(
+    host_url="http://localhost",
+    path="/foo",
+    path_pattern="/foo",
+    method="get",
+    route_name="foo",
+)
+RESPONSE = OpenAPIResponseSnapshot(
+    data=b"1", status_code=200, content_type="application/json", headers={}
+)
+
+
+def test_report_mode_logs_violations(caplog: pytest.LogCaptureFixture) -> None:
+    """Invalid responses are sent to the client and logged in the background."""
+    app = make_app(
+        DOCUMENT,
+        lambda request: "not-an-integer",
+        **{"pyramid_openapi3.response_validation_mode": "report"},
+    )
+    reporter = app.app.registry.settings["pyramid_openapi3_response_reporter"]
+
+    assert app.get("/foo", status=200).json == "not-an-integer"
+    reporter.join()
+
+    assert reporter.submitted == 1
+    assert reporter.violations == 1
+    assert caplog.records[-1].levelno == logging.ERROR
+    assert (
+        caplog.records[-1]
+        .getMessage()
+        .startswith("Response validation failed for GET /foo (foo): ")
+    )
+
+
+def test_report_mode_valid_response(caplog: pytest.LogCaptureFixture) -> None:
+    """Valid responses are not reported."""
+    app = make_app(
+        DOCUMENT,
+        lambda request: 1,
+        **{"pyramid_openapi3.response_validation_mode": "report"},
+    )
+    reporter = app.app.registry.settings["pyramid_openapi3_response_reporter"]
+
+    assert app.get("/foo", status=200).json == 1
+    reporter.join()
+
+    assert reporter.submitted == 1
+    assert reporter.violations == 0
+    assert not caplog.records
+
+
+def test_invalid_mode() -> None:
+    """Unknown validation modes are a configuration error."""
+    with pytest.raises(ConfigurationError, match="got 'lenient'"):
+        make_app(
+            DOCUMENT,
+            lambda request: 1,
+            **{"pyramid_openapi3.response_validation_mode": "lenient"},
+        )
+
+
+class BlockingValidator:  # noqa: D101
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def iter_errors(self, request: Request, response: t.Any) -> list[Exception]:
+        """Block until released."""
+        self.started.set()
+        self.release.wait(timeout=5)
+        return []
+
+
+def test_drop_when_full() -> None:
+    """Jobs are dropped instead of queued once the queue is full."""
+    reporter = BackgroundResponseValidator(workers=1, queue_size=1)
+    validator = BlockingValidator()
+
+    assert reporter.submit(validator, REQUEST, RESPONSE)  # picked up by the worker
+    assert validator.started.wait(timeout=5)
+    assert reporter.submit(validator, REQUEST, RESPONSE)  # waits in the queue
+    assert not reporter.submit(validator, REQUEST, RESPONSE)  # dropped
+
+    validator.release.set()
+    reporter.join()
+    assert reporter.submitted == 2
+    assert reporter.dropped == 1
+
+
+class CrashingValidator:  # noqa: D101
+    def iter_errors(self, request: Request, response: t.Any) -> list[Exception]:
+        """Fail unexpectedly."""
+        raise RuntimeError("boom")
+
+
+def test_crash_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Unexpected errors do not kill the worker thread."""
+    reporter = BackgroundResponseValidator()
+
+    reporter.submit(CrashingValidator(), REQUEST, RESPONSE)
+    reporter.join()
+    validator = BlockingValidator()
+    validator.release.set()
+    reporter.submit(validator, REQUEST, RESPONSE)
+    reporter.join()
+    assert validator.started.is_set()
+
+    assert caplog.records[0].getMessage() == "Response validation for GET /foo crashed"
+    assert reporter.submitted == 2
+
+
+class FailingValidator:  # noqa: D101
+    def iter_errors(self, request: Request, response: t.Any) -> list[Exception]:
+        """Report a violation."""
+        return [ValueError("bad")]
+
+
+def test_counts_from_many_threads() -> None:
+    """Counts aren't lost when updated from request and worker threads."""
+    reporter = BackgroundResponseValidator(workers=4, queue_size=10000)
+    validator = FailingValidator()
+
+    def submit() -> None:
+        for _ in range(200):
+            reporter.submit(validator, REQUEST, RESPONSE)
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    reporter.join()
+    assert reporter.submitted == reporter.violations == 1600
+    assert reporter.dropped == 0
@@ -0,0 +1,159 @@
+"""Tests for the slow validation log."""
+
+from _pytest.logging import LogCaptureFixture
+from jsonschema_path import SchemaPath
+from pyramid.exceptions import ConfigurationError
+from pyramid.request import Request
+from pyramid.testing import DummyRequest
+from pyramid_openapi3.slowlog import SchemaTimings
+from pyramid_openapi3.slowlog import SlowValidationLog
+from pyramid_openapi3.slowlog import schema_pointer
+from pyramid_openapi3.slowlog import time_schema
+from pyramid_openapi3.tests.helpers import make_app
+from unittest import mock
+
+import logging
+import pytest
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        post:
+          operationId: create_foo
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    bar:
+                      type: string
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: string
+"""
+
+
+def _foo_view(request: Request) -> t.Any:
+    return request.openapi_validated.body["bar"]
+
+
+def test_schema_pointer() -> None:
+    """Path keys are escaped in JSON pointers."""
+    spec = SchemaPath.from_dict({"paths": {"/a~b": {"parameters": [{"schema": {}}]}}})
+    schema = spec / "paths" / "/a~b" / "parameters" / 0 / "schema"
+    assert schema_pointer(schema) == "#/paths/~1a~0b/parameters/0/schema"
+
+
+def test_schema_timings() -> None:
+    """Schemas are only timed while timings are active, slowest first."""
+    spec = SchemaPath.from_dict({"a": {}, "b": {}, "c": {}})
+    timings = SchemaTimings()
+    with time_schema(spec / "a"):
+        pass
+    with (
+        timings.activate(),
+        mock.patch("time.perf_counter", side_effect=[0.0, 1.0, 1.0, 4.0, 4.0, 6.0]),
+    ):
+        for name in "abc":
+            with time_schema(spec / name):
+                pass
+    assert timings.slowest(2) == [("#/b", 3.0), ("#/c", 2.0)]
+
+
+@pytest.mark.parametrize("value", ["fast", "-1", None])
+def test_threshold_setting(value: t.Any) -> None:
+    """The threshold is given in milliseconds."""
+    settings = {"pyramid_openapi3.slow_validation_threshold": value}
+    if value is None:
+        assert SlowValidationLog.from_settings(settings) is None
+    else:
+        with pytest.raises(ConfigurationError, match="must be a number"):
+            SlowValidationLog.from_settings(settings)
+
+    settings["pyramid_openapi3.slow_validation_threshold"] = "250"
+    log = SlowValidationLog.from_settings(settings)
+    assert log is not None
+    assert log.threshold == 0.25
+
+
+def test_check(caplog: LogCaptureFixture) -> None:
+    """Unknown body sizes, operations and schemas are logged as such."""
+    request = DummyRequest(
+        matched_route=mock.Mock(), openapi_request=mock.Mock(spec=[])
+    )
+    request.matched_route.name = "foo"
+    log = SlowValidationLog(threshold=0.1)
+
+    log.check("response", request, 0.09, SchemaTimings(), None)  # ty: ignore[invalid-argument-type]
+    assert caplog.records == []
+
+    log.check("response", request, 0.1, SchemaTimings(), None)  # ty: ignore[invalid-argument-type]
+    assert caplog.messages == [
+        (
+            "Slow response validation for route foo, operation None: 100.0ms, "
+            "body of unknown bytes, slowest schemas: none"
+        )
+    ]
+
+
+def test_slow_validations_are_logged(caplog: LogCaptureFixture) -> None:
+    """Validations slower than the threshold are logged with their schemas."""
+    app = make_app(
+        DOCUMENT, _foo_view, **{"pyramid_openapi3.slow_validation_threshold": 0}
+    )
+    with caplog.at_level(logging.WARNING, logger="pyramid_openapi3.slowlog"):
+        app.post_json("/foo", {"bar": "baz"}, status=200)
+
+    request_log, response_log = caplog.messages
+    assert request_log.startswith(
+        "Slow request validation for route foo, operation create_foo: "
+    )
+    assert (
+        "body of 14 bytes, slowest schemas: "
+        "#/paths/~1foo/post/requestBody/content/application~1json/schema ("
+        in request_log
+    )
+    assert response_log.startswith(
+        "Slow response validation for route foo, operation create_foo: "
+    )
+    assert (
+        "body of 5 bytes, slowest schemas: "
+        "#/paths/~1foo/post/responses/200/content/application~1json/schema ("
+        in response_log
+    )
+
+
+def test_fast_validations_are_not_logged(caplog: LogCaptureFixture) -> None:
+    """Validations faster than the threshold are not logged."""
+    app = make_app(
+        DOCUMENT, _foo_view, **{"pyramid_openapi3.slow_validation_threshold": 60000}
+    )
+    app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert caplog.records == []
+
+
+def test_background_validations_are_not_logged(caplog: LogCaptureFixture) -> None:
+    """Report-only response validation is not timed on the request thread."""
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        **{
+            "pyramid_openapi3.slow_validation_threshold": 0,
+            "pyramid_openapi3.response_validation_mode": "report",
+        },
+    )
+    with caplog.at_level(logging.WARNING, logger="pyramid_openapi3.slowlog"):
+        app.post_json("/foo", {"bar": "baz"}, status=200)
+    assert len(caplog.messages) == 1
+    assert caplog.messages[0].startswith("Slow request validation")
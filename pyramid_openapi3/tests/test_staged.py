@@ -0,0 +1,135 @@
+"""Tests for staged request validation."""
+
+from pyramid.request import Request
+from pyramid_openapi3.tests.helpers import make_app
+
+import io
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    components:
+      securitySchemes:
+        api_key:
+          type: apiKey
+          in: header
+          name: X-API-Key
+    security:
+      - api_key: []
+    paths:
+      /foo:
+        post:
+          parameters:
+            - name: limit
+              in: query
+              required: true
+              schema:
+                type: integer
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  required: [bar]
+                  properties:
+                    bar:
+                      type: string
+          responses:
+            200:
+              description: A foo
+            400:
+              description: Bad request
+            401:
+              description: Unauthorized
+"""
+
+
+class TrackedInput(io.BytesIO):
+    """The WSGI input, remembering whether it was read."""
+
+    read_from = False
+
+    def read(self, size: int | None = -1) -> bytes:
+        """Read from the input."""
+        self.read_from = True
+        return super().read(size)
+
+
+class TrackedApp:
+    """Pass the request body to the app as a TrackedInput."""
+
+    def __init__(self, app: t.Callable) -> None:
+        self.app = app
+        self.input: TrackedInput | None = None
+
+    def __call__(self, environ: dict, start_response: t.Callable) -> t.Any:
+        """Call the app with a tracked input."""
+        self.input = TrackedInput(environ["wsgi.input"].read())
+        environ["wsgi.input"] = self.input
+        return self.app(environ, start_response)
+
+
+def _foo_view(request: Request) -> dict:
+    validated = request.openapi_validated
+    return {"limit": validated.parameters.query["limit"], **validated.body}
+
+
+STAGED: dict[str, t.Any] = {"pyramid_openapi3.staged_request_validation": "true"}
+HEADERS = {"X-API-Key": "secret"}
+
+
+def test_valid_request() -> None:
+    """Valid requests are validated in all stages."""
+    app = make_app(DOCUMENT, _foo_view, **STAGED)
+    res = app.post_json("/foo?limit=1", {"bar": "baz"}, headers=HEADERS, status=200)
+    assert res.json == {"limit": 1, "bar": "baz"}
+
+
+def test_invalid_parameters_leave_the_body_unread() -> None:
+    """Requests with invalid parameters are rejected before reading the body."""
+    app = make_app(DOCUMENT, _foo_view, wrap=TrackedApp, **STAGED)
+    res = app.post_json("/foo?limit=abc", {}, headers=HEADERS, status=400)
+    assert res.json == [
+        {
+            "exception": "ParameterValidationError",
+            "message": "Failed to cast value to integer type: abc",
+            "field": "limit",
+        }
+    ]
+    assert app.app.input is not None
+    assert not app.app.input.read_from
+
+
+def test_failed_security_leaves_the_body_unread() -> None:
+    """Requests failing security are rejected before reading the body."""
+    app = make_app(DOCUMENT, _foo_view, wrap=TrackedApp, **STAGED)
+    res = app.post_json("/foo?limit=abc", {}, status=401)
+    assert res.json[0]["exception"] == "SecurityValidationError"
+    assert len(res.json) == 1
+    assert app.app.input is not None
+    assert not app.app.input.read_from
+
+
+def test_invalid_body() -> None:
+    """The body is validated once the parameters are valid."""
+    app = make_app(DOCUMENT, _foo_view, wrap=TrackedApp, **STAGED)
+    res = app.post_json("/foo?limit=1", {}, headers=HEADERS, status=400)
+    assert [error["message"] for error in res.json] == ["'bar' is a required property"]
+    assert app.app.input is not None
+    assert app.app.input.read_from
+
+
+def test_not_staged_by_default() -> None:
+    """By default, errors in parameters and the body are reported together."""
+    app = make_app(DOCUMENT, _foo_view, wrap=TrackedApp)
+    res = app.post_json("/foo?limit=abc", {}, headers=HEADERS, status=400)
+    assert [error["exception"] for error in res.json] == [
+        "ParameterValidationError",
+        "ValidationError",
+    ]
+    assert app.app.input is not None
+    assert app.app.input.read_from
@@ -0,0 +1,133 @@
+"""Tests for validation of streaming responses."""
+
+from pyramid.config import Configurator
+from pyramid.request import Request
+from pyramid.response import FileResponse
+from pyramid.response import Response
+from pyramid_openapi3.tests.helpers import make_app
+from pyramid_openapi3.wrappers import PyramidOpenAPIResponse
+from unittest import mock
+from webtest.app import TestApp
+
+import pytest
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /stream:
+        get:
+          parameters:
+            - name: status
+              in: query
+              schema:
+                type: integer
+          responses:
+            200:
+              description: A stream
+              headers:
+                X-Count:
+                  required: true
+                  schema:
+                    type: integer
+              content:
+                application/json:
+                  schema:
+                    type: integer
+      /file:
+        get:
+          responses:
+            200:
+              description: A file
+              content:
+                text/plain:
+                  schema:
+                    type: string
+"""
+
+
+def _stream_view(request: Request) -> Response:
+    response = Response(
+        app_iter=iter([b'"not-', b'an-integer"']),
+        content_type="application/json",
+        status=int(request.GET.get("status", 200)),
+    )
+    if "count" in request.GET:
+        response.headers["X-Count"] = request.GET["count"]
+    return response
+
+
+def _file_view(request: Request) -> FileResponse:
+    return FileResponse(__file__, request=request, content_type="text/plain")
+
+
+def _add_views(config: Configurator) -> None:
+    config.add_route("stream", "/stream")
+    config.add_view(_stream_view, route_name="stream", openapi=True)
+    config.add_route("file", "/file")
+    config.add_view(_file_view, route_name="file", openapi=True)
+
+
+@pytest.fixture
+def app() -> TestApp:
+    """Create a test app serving streaming responses."""
+    return make_app(DOCUMENT, configure=_add_views)
+
+
+def test_streaming_body_is_not_read(app: TestApp) -> None:
+    """The body of a streaming response is passed through unvalidated."""
+    with mock.patch.object(
+        PyramidOpenAPIResponse,
+        "data",
+        new_callable=mock.PropertyMock,
+        side_effect=AssertionError("body was read"),
+    ):
+        res = app.get("/stream", params={"count": "1"}, status=200)
+        assert res.body == b'"not-an-integer"'
+
+        res = app.get("/file", status=200)
+        assert res.body.startswith(b'"""Tests for validation of streaming')
+
+
+def test_streaming_headers_are_validated(app: TestApp) -> None:
+    """Headers of a streaming response are still validated."""
+    res = app.get("/stream", status=500)
+    assert res.json == [
+        {
+            "exception": "MissingRequiredHeader",
+            "message": "Missing required header: X-Count",
+            "field": "X-Count",
+        }
+    ]
+
+    res = app.get("/stream", params={"count": "many"}, status=500)
+    assert res.json[0]["exception"] == "HeaderValidationError"
+
+
+def test_streaming_status_is_validated(app: TestApp) -> None:
+    """The status code of a streaming response is still validated."""
+    res = app.get("/stream", params={"count": "1", "status": "201"}, status=500)
+    assert res.json == [
+        {
+            "exception": "ResponseNotFound",
+            "message": "Unknown response http status: 201",
+        }
+    ]
+
+
+def test_validate_streaming_body() -> None:
+    """Streaming bodies are validated when explicitly enabled."""
+    app = make_app(
+        DOCUMENT,
+        configure=_add_views,
+        **{"pyramid_openapi3.validate_streaming_response_body": "true"},
+    )
+    res = app.get("/stream", params={"count": "1"}, status=500)
+    assert res.json == [
+        {
+            "exception": "ValidationError",
+            "message": "'not-an-integer' is not of type 'integer'",
+        }
+    ]
@@ -0,0 +1,177 @@
+"""Tests for per-phase validation timings."""
+
+from pyramid.request import Request
+from pyramid_openapi3.tests.helpers import make_app
+from pyramid_openapi3.timing import PhaseTimings
+from pyramid_openapi3.timing import phase
+from unittest import mock
+from urllib.parse import urlencode
+from webtest.app import TestApp
+
+import typing as t
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    security:
+      - api_key: []
+    components:
+      securitySchemes:
+        api_key:
+          type: apiKey
+          in: header
+          name: X-API-Key
+    paths:
+      /foo:
+        post:
+          parameters:
+            - name: limit
+              in: query
+              schema:
+                type: integer
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    bar:
+                      type: string
+          responses:
+            200:
+              description: A foo
+              content:
+                application/json:
+                  schema:
+                    type: string
+                    enum: [baz]
+            401:
+              description: Unauthorized
+"""
+
+REQUEST_PHASES = {"adapter", "lookup", "security", "parameters", "body", "schema"}
+
+
+def _foo_view(request: Request) -> t.Any:
+    if "respond" in request.GET:
+        return request.GET["respond"]
+    return request.openapi_validated.body["bar"]
+
+
+def _post(app: TestApp, status: int = 200, **params: t.Any) -> t.Any:
+    return app.post_json(
+        f"/foo?{urlencode({'limit': 1, **params})}",
+        {"bar": "baz"},
+        headers={"X-API-Key": "secret"},
+        status=status,
+    )
+
+
+def test_phases_are_exclusive() -> None:
+    """Time spent in a nested phase is not counted towards the outer phase."""
+    timings = PhaseTimings()
+    with mock.patch("time.perf_counter", side_effect=[0.0, 1.0, 3.0, 6.0]):
+        with timings.phase("outer"), timings.phase("inner"):
+            pass
+    assert timings == {"inner": 2.0, "outer": 4.0}
+
+    with mock.patch("time.perf_counter", side_effect=[10.0, 10.5]):
+        with timings.phase("inner"):
+            pass
+    assert timings == {"inner": 2.5, "outer": 4.0}
+    assert timings.server_timing() == (
+        "openapi.inner;dur=2500.000, openapi.outer;dur=4000.000"
+    )
+
+
+def test_phase_without_active_timings() -> None:
+    """Phases are only recorded while timings are active."""
+    timings = PhaseTimings()
+    with phase("lookup"):
+        pass
+    with timings.activate():
+        with phase("lookup"):
+            pass
+    with phase("schema"):
+        pass
+    assert list(timings) == ["lookup"]
+
+
+def test_timings_disabled_by_default() -> None:
+    """No timings are recorded and no header is sent unless enabled."""
+    app = make_app(DOCUMENT, _foo_view)
+    res = _post(app)
+    assert "Server-Timing" not in res.headers
+    assert "pyramid_openapi3.timings" not in res.request.environ
+
+
+def test_record_timings() -> None:
+    """All validation phases are recorded in the request environ."""
+    app = make_app(DOCUMENT, _foo_view, **{"pyramid_openapi3.record_timings": True})
+    res = _post(app)
+    assert "Server-Timing" not in res.headers
+    timings = res.request.environ["pyramid_openapi3.timings"]
+    assert set(timings) == REQUEST_PHASES | {"response"}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_server_timing_header() -> None:
+    """Timings are sent in a Server-Timing header."""
+    app = make_app(DOCUMENT, _foo_view, **{"pyramid_openapi3.server_timing": True})
+    res = _post(app)
+    metrics = [
+        metric.split(";")[0] for metric in res.headers["Server-Timing"].split(", ")
+    ]
+    assert set(metrics) == {f"openapi.{name}" for name in REQUEST_PHASES | {"response"}}
+
+
+def test_server_timing_header_on_validation_errors() -> None:
+    """The header is also sent with validation error responses."""
+    app = make_app(DOCUMENT, _foo_view, **{"pyramid_openapi3.server_timing": True})
+
+    res = _post(app, status=500, respond="qux")
+    assert "openapi.response;dur=" in res.headers["Server-Timing"]
+
+    res = app.post_json("/foo", {"bar": "baz"}, status=401)
+    assert "openapi.security;dur=" in res.headers["Server-Timing"]
+
+
+def test_server_timing_header_without_validation() -> None:
+    """Only phases that ran are sent."""
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        **{
+            "pyramid_openapi3.server_timing": True,
+            "pyramid_openapi3.enable_request_validation": False,
+        },
+    )
+    res = _post(app, respond="baz")
+    assert res.headers["Server-Timing"].startswith("openapi.response;dur=")
+
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        **{
+            "pyramid_openapi3.server_timing": True,
+            "pyramid_openapi3.enable_response_validation": False,
+        },
+    )
+    res = _post(app)
+    assert "openapi.schema;dur=" in res.headers["Server-Timing"]
+    assert "openapi.response" not in res.headers["Server-Timing"]
+
+    app = make_app(
+        DOCUMENT,
+        _foo_view,
+        **{
+            "pyramid_openapi3.server_timing": True,
+            "pyramid_openapi3.enable_request_validation": False,
+            "pyramid_openapi3.enable_response_validation": False,
+        },
+    )
+    res = _post(app, respond="baz")
+    assert "Server-Timing" not in res.headers
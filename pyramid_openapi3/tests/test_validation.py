@@ -12,6 +12,7 @@ from pyramid.testing import DummyRequest
 from pyramid.testing import setUp
 from pyramid.testing import tearDown
 from unittest import TestCase
+from unittest import mock
 from zope.interface import Interface
 
 import json
@@ -301,10 +302,12 @@ class TestRequestValidation(RequestValidationBase):  # noqa: D101
         response = router(environ, start_response)
         self.assertEqual(start_response.status, "400 Bad Request")
 
-        # now let's disable it
+        # now let's disable it, settings are read when the view is configured
         self.config.registry.settings["pyramid_openapi3.enable_request_validation"] = (
             False
         )
+        self._add_view(lambda *arg: {"test": "correct"})
+        router = Router(self.config.registry)
         start_response = DummyStartResponse()
         response = router(environ, start_response)
         self.assertEqual(start_response.status, "200 OK")
@@ -329,10 +332,12 @@ class TestRequestValidation(RequestValidationBase):  # noqa: D101
         response = router(environ, start_response)
         self.assertEqual(start_response.status, "500 Internal Server Error")
 
-        # now let's disable it
+        # now let's disable it, settings are read when the view is configured
         self.config.registry.settings["pyramid_openapi3.enable_response_validation"] = (
             False
         )
+        self._add_view(lambda *arg: "not-valid")
+        router = Router(self.config.registry)
         start_response = DummyStartResponse()
         response = router(environ, start_response)
         self.assertEqual(start_response.status, "200 OK")
@@ -340,11 +345,10 @@ class TestRequestValidation(RequestValidationBase):  # noqa: D101
 
     def test_request_validation_disabled_response_validation_enabled(self) -> None:
         """Test response validation still works if request validation is disabled."""
-        self._add_view(lambda *arg: "not-valid")
-
         self.config.registry.settings["pyramid_openapi3.enable_request_validation"] = (
             False
         )
+        self._add_view(lambda *arg: "not-valid")
 
         # by default validation is enabled
         router = Router(self.config.registry)
@@ -538,3 +542,93 @@ class TestOpenAPI32Validation(TestRequestValidation):
     """Re-runs every TestRequestValidation scenario against a 3.2.0 spec."""
 
     openapi_spec = TestRequestValidation.openapi_spec.replace(b"3.1.0", b"3.2.0")
+
+
+class TestResponseValidationSampling(RequestValidationBase):  # noqa: D101
+    openapi_spec = TestRequestValidation.openapi_spec
+
+    def _get_status(self, **settings: t.Any) -> str:
+        """Render an invalid response with the given settings, return status."""
+        self._add_view(lambda *arg: "not-valid")
+        self.config.registry.settings.update(settings)
+        router = Router(self.config.registry)
+        environ = {
+            "wsgi.url_scheme": "http",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "8080",
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": "/foo",
+            "HTTP_ACCEPT": "application/json",
+            "QUERY_STRING": "bar=1",
+        }
+        start_response = DummyStartResponse()
+        router(environ, start_response)
+        return start_response.status
+
+    def test_sample_rate_zero(self) -> None:
+        """No responses are validated with a sample rate of 0."""
+        status = self._get_status(
+            **{"pyramid_openapi3.response_validation_sample_rate": "0"}
+        )
+        self.assertEqual(status, "200 OK")
+
+    def test_sample_rate(self) -> None:
+        """A fraction of responses is validated."""
+        settings = {"pyramid_openapi3.response_validation_sample_rate": "0.5"}
+        with mock.patch("random.random", return_value=0.4):
+            self.assertEqual(self._get_status(**settings), "500 Internal Server Error")
+        with mock.patch("random.random", return_value=0.6):
+            self.assertEqual(self._get_status(**settings), "200 OK")
+
+    def test_route_sample_rate(self) -> None:
+        """Per-route sample rates override the global one."""
+        status = self._get_status(
+            **{
+                "pyramid_openapi3.response_validation_sample_rate": "0",
+                "pyramid_openapi3.response_validation_sample_rates": {"foo": 1},
+            }
+        )
+        self.assertEqual(status, "500 Internal Server Error")
+
+    def test_route_sample_rate_from_ini(self) -> None:
+        """Per-route sample rates can be set as a string."""
+        status = self._get_status(
+            **{"pyramid_openapi3.response_validation_sample_rates": "other=1 foo=0"}
+        )
+        self.assertEqual(status, "200 OK")
+
+    def test_invalid_sample_rate(self) -> None:
+        """Sample rates outside of [0, 1] are a configuration error."""
+        from pyramid.exceptions import ConfigurationError
+
+        self.config.registry.settings[
+            "pyramid_openapi3.response_validation_sample_rate"
+        ] = "2"
+        with self.assertRaises(ConfigurationError) as cm:
+            Router(self.config.registry)
+        self.assertEqual(
+            str(cm.exception),
+            "pyramid_openapi3.response_validation_sample_rate must be a number "
+            "between 0 and 1, got '2'",
+        )
+
+        self.config.registry.settings[
+            "pyramid_openapi3.response_validation_sample_rate"
+        ] = "half"
+        with self.assertRaises(ConfigurationError):
+            Router(self.config.registry)
+
+    def test_invalid_route_sample_rates(self) -> None:
+        """Per-route sample rates must be route_name=rate items."""
+        from pyramid.exceptions import ConfigurationError
+
+        self.config.registry.settings[
+            "pyramid_openapi3.response_validation_sample_rates"
+        ] = "foo=0 bar"
+        with self.assertRaises(ConfigurationError) as cm:
+            Router(self.config.registry)
+        self.assertEqual(
+            str(cm.exception),
+            "pyramid_openapi3.response_validation_sample_rates: "
+            "expected route_name=rate, got 'bar'",
+        )
@@ -0,0 +1,131 @@
+"""Tests for caching spec validation results."""
+
+from openapi_spec_validator.validation.exceptions import OpenAPIValidationError
+from pathlib import Path
+from pyramid.config import Configurator
+from pyramid_openapi3.loaders import parse_spec
+from pyramid_openapi3.validation_cache import spec_hash
+from pyramid_openapi3.validation_cache import validate_spec
+from unittest import mock
+
+import pytest
+
+DOCUMENT = b"""
+    openapi: "3.1.0"
+    info:
+      version: "1.0.0"
+      title: Foo API
+    paths:
+      /foo:
+        $ref: "paths.yaml#/foo"
+"""
+
+PATHS = b"""
+    foo:
+      get:
+        parameters:
+          - $ref: "#/parameters/limit"
+        responses:
+          200:
+            $ref: "responses/ok.yaml"
+          400:
+            $ref: "responses/ok.yaml"
+    parameters:
+      limit:
+        name: limit
+        in: query
+        schema:
+          type: integer
+"""
+
+RESPONSE = b"""
+    description: A foo
+"""
+
+
+@pytest.fixture
+def spec(tmp_path: Path) -> Path:
+    """Write a spec split across several files."""
+    (tmp_path / "openapi.yaml").write_bytes(DOCUMENT)
+    (tmp_path / "paths.yaml").write_bytes(PATHS)
+    (tmp_path / "responses").mkdir()
+    (tmp_path / "responses" / "ok.yaml").write_bytes(RESPONSE)
+    return tmp_path / "openapi.yaml"
+
+
+def test_spec_hash_covers_referenced_files(spec: Path) -> None:
+    """Changing any referenced file changes the hash, other files don't."""
+    spec_dict = parse_spec(DOCUMENT, "openapi.yaml")
+    before = spec_hash(spec_dict, spec)
+
+    (spec.parent / "unrelated.yaml").write_bytes(b"foo: bar")
+    assert spec_hash(spec_dict, spec) == before
+
+    (spec.parent / "responses" / "ok.yaml").write_bytes(b"description: OK")
+    assert spec_hash(spec_dict, spec) != before
+
+
+def test_spec_hash_skips_unreadable_refs(tmp_path: Path) -> None:
+    """References to remote or missing files don't break hashing."""
+    spec = tmp_path / "openapi.yaml"
+    spec.write_bytes(b"foo")
+    spec_dict = {
+        "foo": [
+            {"$ref": "missing.yaml"},
+            {"$ref": "https://example.com/responses.yaml#/error"},
+        ]
+    }
+    assert spec_hash(spec_dict, spec) == spec_hash({}, spec)
+
+
+def test_validation_is_cached(spec: Path, tmp_path: Path) -> None:
+    """A successful validation is recorded and skipped on the next start."""
+    spec_dict = parse_spec(DOCUMENT, "openapi.yaml")
+    cache_dir = tmp_path / "cache"
+    base_uri = spec.as_uri()
+
+    validate_spec(spec_dict, spec, cache_dir=str(cache_dir), base_uri=base_uri)
+    assert [p.name for p in cache_dir.iterdir()] == [spec_hash(spec_dict, spec)]
+
+    with mock.patch("pyramid_openapi3.validation_cache.validate") as validate:
+        validate_spec(spec_dict, spec, cache_dir=str(cache_dir), base_uri=base_uri)
+        validate.assert_not_called()
+
+        (spec.parent / "paths.yaml").write_bytes(PATHS + b"# changed")
+        validate_spec(spec_dict, spec, cache_dir=str(cache_dir), base_uri=base_uri)
+        validate.assert_called_once_with(spec_dict, base_uri=base_uri)
+
+
+def test_invalid_spec_is_not_cached(tmp_path: Path) -> None:
+    """Failed validations are not recorded."""
+    spec = tmp_path / "openapi.yaml"
+    spec.write_bytes(b'openapi: "3.1.0"')
+    cache_dir = tmp_path / "cache"
+
+    for _ in range(2):
+        with pytest.raises(OpenAPIValidationError):
+            validate_spec({"openapi": "3.1.0"}, spec, cache_dir=str(cache_dir))
+    assert not cache_dir.exists()
+
+
+def test_cache_dir_not_writable(
+    spec: Path, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Failing to record a validation is logged, not raised."""
+    spec_dict = parse_spec(DOCUMENT, "openapi.yaml")
+    cache_dir = tmp_path / "openapi.yaml" / "cache"
+
+    validate_spec(spec_dict, spec, cache_dir=str(cache_dir), base_uri=spec.as_uri())
+    assert "Could not record validation of" in caplog.text
+
+
+def test_spec_directory_setting(spec: Path, tmp_path: Path) -> None:
+    """The cache directory is configured with a setting."""
+    cache_dir = tmp_path / "cache"
+    settings = {"pyramid_openapi3.spec_validation_cache": str(cache_dir)}
+    with Configurator(settings=settings) as config:
+        config.include("pyramid_openapi3")
+        config.pyramid_openapi3_spec_directory(str(spec))
+        config.commit()
+
+    assert len(list(cache_dir.iterdir())) == 1
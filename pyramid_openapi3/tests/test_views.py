@@ -10,6 +10,7 @@ from pyramid.interfaces import IRouteRequest
 from pyramid.interfaces import IRoutesMapper
 from pyramid.interfaces import IView
 from pyramid.interfaces import IViewClassifier
+from pyramid.request import Request
 from pyramid.request import apply_request_extensions
 from pyramid.router import Router
 from pyramid.testing import DummyRequest
@@ -124,7 +125,9 @@ def test_add_spec_view() -> None:
             view = config.registry.adapters.registered(
                 (IViewClassifier, request, Interface), IView, name=""
             )
-            assert view(request=None, context=None).body == MINIMAL_DOCUMENT
+            assert (
+                view(request=Request.blank("/"), context=None).body == MINIMAL_DOCUMENT
+            )
 
 
 def test_add_spec_view_json() -> None:
@@ -153,7 +156,7 @@ def test_add_spec_view_json() -> None:
             view = config.registry.adapters.registered(
                 (IViewClassifier, request, Interface), IView, name=""
             )
-            response = view(request=None, context=None)
+            response = view(request=Request.blank("/"), context=None)
             assert response.content_type == "application/json"
             spec = config.registry.settings["pyramid_openapi3"]["spec"]
             assert json.loads(response.body) == spec.read_value()
@@ -822,6 +825,7 @@ def test_add_explorer_view_with_csp_nonce() -> None:
 
         assert b'<script nonce="test-nonce-123">' in response.body
         assert b"<title>Swagger UI</title>" in response.body
+        assert response.etag is None
 
 
 def test_add_explorer_view_without_csp_nonce() -> None:
@@ -852,3 +856,10 @@ def test_add_explorer_view_without_csp_nonce() -> None:
         assert b"<script>" in response.body
         assert b"nonce=" not in response.body
         assert b"<title>Swagger UI</title>" in response.body
+
+        # Without a nonce the page is cacheable
+        dummy_request = DummyRequest(
+            config=config, headers={"If-None-Match": f'"{response.etag}"'}
+        )
+        response = view(request=dummy_request, context=None)
+        assert response.status_code == 304
@@ -3,9 +3,14 @@
 from dataclasses import dataclass
 from openapi_core.validation.request.datatypes import RequestParameters
 from pyramid.request import Request
+from pyramid.response import FileResponse
+from pyramid.response import Response
 from pyramid.testing import DummyRequest
+from pyramid_openapi3.wrappers import OpenAPIRequestSnapshot
+from pyramid_openapi3.wrappers import OpenAPIResponseSnapshot
 from pyramid_openapi3.wrappers import PyramidOpenAPIRequest
 from pyramid_openapi3.wrappers import PyramidOpenAPIResponse
+from pyramid_openapi3.wrappers import is_streaming_response
 
 
 @dataclass
@@ -101,3 +106,58 @@ def test_mapped_values_response() -> None:
     assert openapi_response.mimetype == "text/html"
     assert openapi_response.content_type == "text/html"
     assert openapi_response.headers == pyramid_request.response.headers
+
+
+def test_snapshots() -> None:
+    """Test that snapshots copy what response validation needs."""
+    pyramid_request = DummyRequest(path="/foo")
+    pyramid_request.matched_route = DummyRoute(name="foo", pattern="/foo")
+    pyramid_request.response.headers["X-Foo"] = "Bar"
+
+    request = OpenAPIRequestSnapshot.from_request(
+        PyramidOpenAPIRequest(pyramid_request)  # ty: ignore[invalid-argument-type]
+    )
+    response = OpenAPIResponseSnapshot.from_response(pyramid_request.response)
+    pyramid_request.response.headers["X-Foo"] = "Baz"
+
+    assert request == OpenAPIRequestSnapshot(
+        host_url="http://example.com",
+        path="/foo",
+        path_pattern="/foo",
+        method="get",
+        route_name="foo",
+    )
+    assert response.data == b""
+    assert response.status_code == 200
+    assert response.mimetype == "text/html"
+    assert response.headers["x-foo"] == "Bar"
+
+
+def test_is_streaming_response() -> None:
+    """Test detection of responses whose body is produced while sending."""
+    assert not is_streaming_response(Response(b"foo"))
+    assert not is_streaming_response(Response(app_iter=[b"foo"]))
+    assert is_streaming_response(Response(app_iter=iter([b"foo"])))
+    file_response = FileResponse(__file__)
+    try:
+        assert is_streaming_response(file_response)
+    finally:
+        file_response.app_iter.close()
+
+
+def test_lazy_parameters() -> None:
+    """Test that query string and cookies are only parsed when accessed."""
+    pyramid_request = Request.blank("/foo?bar=1", headers={"Cookie": "foo=bar"})
+    pyramid_request.matchdict = {}
+
+    openapi_request = PyramidOpenAPIRequest(pyramid_request)
+    assert "webob._parsed_query_vars" not in pyramid_request.environ
+    assert "webob._parsed_cookies" not in pyramid_request.environ
+
+    assert openapi_request.parameters["query"] == {"bar": "1"}
+    assert "webob._parsed_query_vars" in pyramid_request.environ
+    assert "webob._parsed_cookies" not in pyramid_request.environ
+
+    assert openapi_request.parameters.cookie == {"foo": "bar"}
+    assert "webob._parsed_cookies" in pyramid_request.environ
+    assert openapi_request.parameters != {"foo": "bar"}
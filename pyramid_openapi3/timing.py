@@ -0,0 +1,64 @@
+"""Record time spent in each phase of validation."""
+
+from contextlib import contextmanager
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+import time
+import typing as t
+
+_active: ContextVar["PhaseTimings | None"] = ContextVar(
+    "pyramid_openapi3_timings", default=None
+)
+_untimed = nullcontext()
+
+
+class PhaseTimings(dict[str, float]):
+    """Seconds spent per validation phase of a request.
+
+    Phases nest: time spent in a phase entered from within another phase is
+    not counted towards the outer phase, so the values add up to the total
+    time spent validating. Stored in ``request.environ`` under
+    ``pyramid_openapi3.timings`` when timing is enabled.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Time spent in nested phases, for every open phase
+        self._nested: list[float] = []
+
+    @contextmanager
+    def phase(self, name: str) -> t.Generator[None, None, None]:
+        """Time a phase."""
+        self._nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self[name] = self.get(name, 0.0) + elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    @contextmanager
+    def activate(self) -> t.Generator[None, None, None]:
+        """Record phases entered via `phase` into these timings."""
+        token = _active.set(self)
+        try:
+            yield
+        finally:
+            _active.reset(token)
+
+    def server_timing(self) -> str:
+        """Format the timings as a ``Server-Timing`` header value."""
+        return ", ".join(
+            f"openapi.{name};dur={seconds * 1000:.3f}" for name, seconds in self.items()
+        )
+
+
+def phase(name: str) -> t.ContextManager[None]:
+    """Time a phase into the active timings, if any."""
+    timings = _active.get()
+    if timings is None:
+        return _untimed
+    return timings.phase(name)
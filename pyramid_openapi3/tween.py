@@ -2,16 +2,192 @@
 
 from .exceptions import ImproperAPISpecificationWarning
 from .exceptions import ResponseValidationError
-from .wrappers import PyramidOpenAPIRequest
+from .instrumentation import observe
+from .metrics import get_metrics
+from .policy import get_api_settings
+from .reporter import BackgroundResponseValidator
+from .wrappers import OpenAPIRequestSnapshot
+from .wrappers import OpenAPIResponseSnapshot
 from .wrappers import PyramidOpenAPIResponse
+from .wrappers import RenderedJSON
+from .wrappers import is_streaming_response
+from contextlib import nullcontext
+from pyramid.exceptions import ConfigurationError
 from pyramid.registry import Registry
 from pyramid.request import Request
 from pyramid.response import Response
+from pyramid.settings import asbool
+from pyramid.settings import aslist
 
+import random
 import typing as t
 import warnings
 
 
+def _parse_sample_rate(value: t.Any, name: str) -> float:
+    try:
+        rate = float(value)
+    except (TypeError, ValueError):
+        rate = -1.0
+    if not 0.0 <= rate <= 1.0:
+        raise ConfigurationError(
+            f"{name} must be a number between 0 and 1, got {value!r}"
+        )
+    return rate
+
+
+def _parse_sample_rates(value: t.Any) -> dict[str, float]:
+    """Parse per-route sample rates.
+
+    Accepts either a dict or, as it comes from an .ini file, a string of
+    whitespace-separated `route_name=rate` items.
+    """
+    if not value:
+        return {}
+    if isinstance(value, str):
+        items = aslist(value)
+        for item in items:
+            if "=" not in item:
+                raise ConfigurationError(
+                    "pyramid_openapi3.response_validation_sample_rates: "
+                    f"expected route_name=rate, got {item!r}"
+                )
+        value = dict(item.split("=", 1) for item in items)
+    return {
+        route_name: _parse_sample_rate(rate, f"Sample rate for route {route_name}")
+        for route_name, rate in value.items()
+    }
+
+
+def _create_sampler(settings: dict) -> t.Callable[[Request], bool]:
+    """Decide, per request, whether its response should be validated."""
+    sample_rate = _parse_sample_rate(
+        settings.get("pyramid_openapi3.response_validation_sample_rate", 1),
+        "pyramid_openapi3.response_validation_sample_rate",
+    )
+    route_sample_rates = _parse_sample_rates(
+        settings.get("pyramid_openapi3.response_validation_sample_rates")
+    )
+
+    def sampled(request: Request) -> bool:
+        rate = sample_rate
+        if route_sample_rates and request.matched_route is not None:
+            rate = route_sample_rates.get(request.matched_route.name, sample_rate)
+        return rate >= 1.0 or random.random() < rate  # noqa: S311
+
+    return sampled
+
+
+def _create_reporter(settings: dict) -> BackgroundResponseValidator | None:
+    """Create the background validator if running in report-only mode."""
+    mode = settings.get("pyramid_openapi3.response_validation_mode", "enforce")
+    if mode not in ("enforce", "report"):
+        raise ConfigurationError(
+            "pyramid_openapi3.response_validation_mode must be one of "
+            f"'enforce' or 'report', got {mode!r}"
+        )
+    if mode == "enforce":
+        return None
+
+    reporter = BackgroundResponseValidator(
+        workers=int(settings.get("pyramid_openapi3.response_validation_workers", 1)),
+        queue_size=int(
+            settings.get("pyramid_openapi3.response_validation_queue_size", 1000)
+        ),
+        metrics=get_metrics(settings),
+    )
+    settings["pyramid_openapi3_response_reporter"] = reporter
+    return reporter
+
+
+def _rendered_json(request: Request, response: Response) -> RenderedJSON | None:
+    """Return what the `openapi_json` renderer rendered, if it is the body."""
+    rendered = request.environ.get("pyramid_openapi3.rendered_json")
+    if (
+        rendered is None
+        or is_streaming_response(response)
+        or response.body is not rendered.body
+    ):
+        return None
+    return rendered
+
+
+def _validate_response(
+    request: Request,
+    response: Response,
+    reporter: BackgroundResponseValidator | None,
+    validate_streaming_body: bool,
+) -> list[Exception] | None:
+    """Validate the response, or submit it to the background validator.
+
+    Return the validation errors, or None if validation was submitted.
+    """
+    openapi_request = request.openapi_request
+    settings = get_api_settings(request)
+    with_body = validate_streaming_body or not is_streaming_response(response)
+    validator = settings[
+        "response_validator" if with_body else "response_headers_validator"
+    ]
+    if reporter is not None:
+        reporter.submit(
+            validator,
+            OpenAPIRequestSnapshot.from_request(openapi_request),
+            OpenAPIResponseSnapshot.from_response(response, with_body=with_body),
+            settings["apiname"],
+        )
+        return None
+
+    rendered = _rendered_json(request, response)
+    openapi_response = PyramidOpenAPIResponse(response, rendered)
+    errors = list(
+        validator.iter_errors(request=openapi_request, response=openapi_response)
+    )
+    if errors and rendered is not None:
+        # The object can differ from its JSON, e.g. tuples become arrays,
+        # so only errors in the body that was actually sent count
+        openapi_response = PyramidOpenAPIResponse(response)
+        errors = list(
+            validator.iter_errors(request=openapi_request, response=openapi_response)
+        )
+    request_validated = request.environ.get("pyramid_openapi3.validate_request")
+    if errors and request_validated and request.openapi_validated.errors:
+        warnings.warn_explicit(
+            ImproperAPISpecificationWarning(
+                f"Discarding {response.status} validation error with body "
+                f"{response.text} as it is not a valid response for "
+                f"{request.method} to {request.path} ({request.matched_route.name})"
+            ),
+            None,
+            settings["filepath"],
+            0,
+        )
+    return errors
+
+
+def _check_response(
+    request: Request,
+    response: Response,
+    reporter: BackgroundResponseValidator | None,
+    validate_streaming_body: bool,
+) -> None:
+    """Validate the response, recording timings, metrics and slow validations."""
+    timings = request.environ.get("pyramid_openapi3.timings")
+    phase = nullcontext() if timings is None else timings.phase("response")
+    if not request.environ.get("pyramid_openapi3.observed"):
+        with phase:
+            errors = _validate_response(
+                request, response, reporter, validate_streaming_body
+            )
+    else:
+        with observe(request, "response") as observation, phase:
+            errors = _validate_response(
+                request, response, reporter, validate_streaming_body
+            )
+            observation.record(errors, response.content_length)
+    if errors:
+        raise ResponseValidationError(response=response, errors=errors)
+
+
 def response_tween_factory(
     handler: t.Callable[[Request], Response], registry: Registry
 ) -> t.Callable[[Request], Response]:
@@ -25,45 +201,43 @@ def response_tween_factory(
     The advantage is, that these are server errors, and if 500 errors are
     only possible due to response validation errors we don't need to document
     them in the openapi spec file.
+
+    With `pyramid_openapi3.response_validation_mode = report`, responses are
+    instead validated in background threads and violations are only logged.
+
+    Streaming responses (e.g. `FileResponse`) only get their status and
+    headers validated, so that their body is not read into memory, unless
+    `pyramid_openapi3.validate_streaming_response_body` is enabled.
     """
+    reporter = _create_reporter(registry.settings)
+    sampled = _create_sampler(registry.settings)
+    validate_streaming_body = asbool(
+        registry.settings.get("pyramid_openapi3.validate_streaming_response_body")
+    )
+    server_timing = asbool(registry.settings.get("pyramid_openapi3.server_timing"))
 
     def excview_tween(request: Request) -> Response:
         try:
             response = handler(request)
-            if not request.environ.get("pyramid_openapi3.validate_response"):
-                return response
-
-            # validate response
-            openapi_request = PyramidOpenAPIRequest(request)
-            openapi_response = PyramidOpenAPIResponse(response)
-            settings_key = "pyramid_openapi3"
-            gsettings = settings = request.registry.settings[settings_key]
-            if "routes" in gsettings:
-                settings_key = gsettings["routes"][request.matched_route.name]
-                settings = request.registry.settings[settings_key]
-            errors = list(
-                settings["response_validator"].iter_errors(
-                    request=openapi_request, response=openapi_response
+            if request.environ.get("pyramid_openapi3.validate_response") and sampled(
+                request
+            ):
+                _check_response(request, response, reporter, validate_streaming_body)
+            elif request.environ.get("pyramid_openapi3.metrics") is not None:
+                request.environ["pyramid_openapi3.metrics"].skipped(
+                    "response",
+                    request.matched_route.name,
+                    get_api_settings(request)["apiname"],
                 )
-            )
-            request_validated = request.environ.get("pyramid_openapi3.validate_request")
-            if errors:
-                if request_validated and request.openapi_validated.errors:
-                    warnings.warn_explicit(
-                        ImproperAPISpecificationWarning(
-                            f"Discarding {response.status} validation error with body "
-                            f"{response.text} as it is not a valid response for "
-                            f"{request.method} to {request.path} ({request.matched_route.name})"
-                        ),
-                        None,
-                        registry.settings[settings_key]["filepath"],
-                        0,
-                    )
-                raise ResponseValidationError(response=response, errors=errors)  # noqa: TRY301
 
         # If there is no exception view, we also see request validation errors here
         except ResponseValidationError:
-            return request.invoke_exception_view(reraise=True)
+            response = request.invoke_exception_view(reraise=True)
+
+        if server_timing:
+            timings = request.environ.get("pyramid_openapi3.timings")
+            if timings:
+                response.headers["Server-Timing"] = timings.server_timing()
         return response
 
     return excview_tween
@@ -0,0 +1,94 @@
+"""Remember successful spec validations across process starts."""
+
+from .loaders import parse_spec
+from importlib.metadata import version
+from openapi_spec_validator import validate
+from pathlib import Path
+
+import hashlib
+import logging
+import os
+import tempfile
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+
+def validate_spec(
+    spec_dict: t.Mapping[str, t.Any],
+    filepath: str | Path,
+    cache_dir: str | None = None,
+    base_uri: str = "",
+) -> None:
+    """Validate the spec, unless `cache_dir` records it as already valid.
+
+    The cache key is a hash of the spec file, every file it references, and
+    the openapi-spec-validator version. Only successful validations are
+    recorded, so an invalid spec always raises.
+    """
+    if not cache_dir:
+        validate(spec_dict, base_uri=base_uri)
+        return
+
+    marker = Path(cache_dir) / spec_hash(spec_dict, Path(filepath))
+    if marker.exists():
+        logger.debug("Skipping validation of %s, found %s", filepath, marker)
+        return
+
+    validate(spec_dict, base_uri=base_uri)
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=marker.parent)
+        os.close(fd)
+        Path(tmp).replace(marker)
+    except OSError as e:
+        logger.warning("Could not record validation of %s: %s", filepath, e)
+
+
+def spec_hash(spec_dict: t.Mapping[str, t.Any], filepath: Path) -> str:
+    """Hash a spec together with all files it references via `$ref`."""
+    digest = hashlib.sha256(version("openapi-spec-validator").encode())
+    for name, content in sorted(referenced_files(spec_dict, filepath).items()):
+        digest.update(name.encode())
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def referenced_files(
+    spec_dict: t.Mapping[str, t.Any], filepath: Path
+) -> dict[str, bytes]:
+    """Return contents of the spec file and all files it references.
+
+    Keys are paths relative to the directory of the spec file.
+    """
+    root = filepath.resolve()
+    contents = {root: root.read_bytes()}
+    pending = [(root, ref) for ref in _external_refs(spec_dict)]
+    while pending:
+        referrer, ref = pending.pop()
+        path = (referrer.parent / ref).resolve()
+        if path in contents or not path.is_file():
+            continue
+        contents[path] = path.read_bytes()
+        pending.extend(
+            (path, ref) for ref in _external_refs(parse_spec(contents[path], path))
+        )
+    return {
+        Path(os.path.relpath(path, root.parent)).as_posix(): content
+        for path, content in contents.items()
+    }
+
+
+def _external_refs(node: t.Any) -> t.Iterator[str]:
+    """Yield paths of local files referenced from a parsed document."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "$ref" and isinstance(value, str):
+                ref = value.split("#", 1)[0]
+                if ref and "://" not in ref:
+                    yield ref
+            else:
+                yield from _external_refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _external_refs(item)
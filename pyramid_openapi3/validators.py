@@ -0,0 +1,324 @@
+"""openapi-core validators that resolve operations via an OperationIndex."""
+
+from .index import OperationIndex
+from .slowlog import time_schema
+from .timing import phase
+from .wrappers import PyramidOpenAPIRequest
+from .wrappers import RenderedJSON
+from contextvars import ContextVar
+from jsonschema_path import SchemaPath
+from openapi_core import V30ResponseValidator as _V30ResponseValidator
+from openapi_core import V31ResponseValidator as _V31ResponseValidator
+from openapi_core import V32ResponseValidator as _V32ResponseValidator
+from openapi_core.datatypes import Parameters
+from openapi_core.datatypes import RequestParameters
+from openapi_core.templating.paths.datatypes import PathOperationServer
+from openapi_core.templating.paths.exceptions import PathError
+from openapi_core.unmarshalling.request import (
+    V30RequestUnmarshaller as _V30RequestUnmarshaller,
+)
+from openapi_core.unmarshalling.request import (
+    V31RequestUnmarshaller as _V31RequestUnmarshaller,
+)
+from openapi_core.unmarshalling.request import (
+    V32RequestUnmarshaller as _V32RequestUnmarshaller,
+)
+from openapi_core.unmarshalling.request.datatypes import RequestUnmarshalResult
+from openapi_core.validation.response import (
+    V30ResponseHeadersValidator as _V30ResponseHeadersValidator,
+)
+from openapi_core.validation.response import (
+    V31ResponseHeadersValidator as _V31ResponseHeadersValidator,
+)
+from openapi_core.validation.response import (
+    V32ResponseHeadersValidator as _V32ResponseHeadersValidator,
+)
+
+import typing as t
+
+_unmarshalling: ContextVar[PyramidOpenAPIRequest | None] = ContextVar(
+    "pyramid_openapi3_unmarshalling", default=None
+)
+
+
+class IndexedPathFinderMixin:
+    """Look up the operation in an OperationIndex before scanning the spec.
+
+    The result is cached on the PyramidOpenAPIRequest, so that response
+    validation reuses the operation resolved during request validation.
+    """
+
+    path_finder: t.Any
+
+    def __init__(
+        self,
+        spec: SchemaPath,
+        *args: t.Any,
+        operation_index: OperationIndex | None = None,
+        **kwargs: t.Any,
+    ) -> None:
+        super().__init__(spec, *args, **kwargs)  # ty: ignore[too-many-positional-arguments]
+        self.operation_index = operation_index
+
+    def _find_path(self, request: t.Any) -> PathOperationServer:
+        found = getattr(request, "path_operation", None)
+        if found is not None:
+            return found
+        with phase("lookup"):
+            if self.operation_index is not None:
+                found = self.operation_index.find(request, self.path_finder)
+            if found is None:
+                found = super()._find_path(request)
+        if isinstance(request, PyramidOpenAPIRequest):
+            request.path_operation = found
+        return found
+
+
+class EmptyOperationsMixin:
+    """Skip unmarshalling requests to operations with nothing to validate.
+
+    The operation is still looked up, so that requests to unknown servers
+    still fail validation, and so that response validation can reuse it.
+    """
+
+    operation_index: OperationIndex | None
+
+    def unmarshal(self, request: t.Any) -> RequestUnmarshalResult:
+        """Unmarshal the request, unless there is nothing to unmarshal."""
+        if self.operation_index is None or not self.operation_index.is_empty(
+            request.route_name, request.method
+        ):
+            return super().unmarshal(request)
+        try:
+            self._find_path(request)
+        except PathError as exc:
+            return RequestUnmarshalResult(errors=[exc])
+        # A new result every time, views may modify it
+        return RequestUnmarshalResult(
+            errors=[], body=None, parameters=Parameters(), security={}
+        )
+
+
+def is_json(mimetype: str) -> bool:
+    """Return whether the mimetype is JSON or a JSON based format."""
+    return mimetype == "application/json" or mimetype.endswith("+json")
+
+
+class SharedJSONBodyMixin:
+    """Keep the JSON request body deserialized during unmarshalling.
+
+    It is stored on the PyramidOpenAPIRequest, so that
+    `request.openapi_json_body` does not parse the body a second time.
+    """
+
+    def _unmarshal(
+        self, request: t.Any, operation: SchemaPath, path: SchemaPath
+    ) -> RequestUnmarshalResult:
+        if not isinstance(request, PyramidOpenAPIRequest):
+            return super()._unmarshal(request, operation, path)
+        token = _unmarshalling.set(request)
+        try:
+            return super()._unmarshal(request, operation, path)
+        finally:
+            _unmarshalling.reset(token)
+
+    def _deserialise_media_type(
+        self,
+        media_type: SchemaPath,
+        mimetype: str,
+        parameters: t.Mapping[str, str],
+        value: bytes,
+    ) -> t.Any:
+        deserialised = super()._deserialise_media_type(
+            media_type, mimetype, parameters, value
+        )
+        request = _unmarshalling.get()
+        # Parameters can have content too, only keep the request body
+        if request is not None and value is request.body and is_json(request.mimetype):
+            request.json_body = deserialised
+        return deserialised
+
+
+class StagedUnmarshalMixin:
+    """Unmarshal security, then parameters, then the body, stopping at errors.
+
+    openapi-core stops when security fails, but still reads and validates
+    the body of requests with invalid parameters, to report all errors at
+    once. With `staged=True` it stops there too, so that large uploads are
+    rejected without ever reading `wsgi.input`: `PyramidOpenAPIRequest.body`
+    is only read when the body stage runs.
+    """
+
+    def __init__(
+        self,
+        spec: SchemaPath,
+        *args: t.Any,
+        staged: bool = False,
+        **kwargs: t.Any,
+    ) -> None:
+        super().__init__(spec, *args, **kwargs)  # ty: ignore[too-many-positional-arguments]
+        self.staged = staged
+
+    def _unmarshal(
+        self, request: t.Any, operation: SchemaPath, path: SchemaPath
+    ) -> RequestUnmarshalResult:
+        if not self.staged:
+            return super()._unmarshal(request, operation, path)
+        security = self._unmarshal_security(request, operation, path)
+        if security.errors:
+            return security
+        parameters = self._unmarshal_parameters(request, operation, path)
+        if parameters.errors:
+            return RequestUnmarshalResult(
+                errors=parameters.errors,
+                parameters=parameters.parameters,
+                security=security.security,
+            )
+        body = self._unmarshal_body(request, operation, path)
+        return RequestUnmarshalResult(
+            errors=body.errors,
+            body=body.body,
+            parameters=parameters.parameters,
+            security=security.security,
+        )
+
+
+class TimedRequestPhasesMixin:
+    """Time the phases of request unmarshalling into the active timings.
+
+    Schema validation of parameters and the body is timed on its own, and
+    not counted towards the ``parameters`` and ``body`` phases.
+    """
+
+    def _get_security(
+        self, parameters: RequestParameters, operation: SchemaPath
+    ) -> dict[str, str] | None:
+        with phase("security"):
+            return super()._get_security(parameters, operation)
+
+    def _get_parameters(
+        self, parameters: RequestParameters, operation: SchemaPath, path: SchemaPath
+    ) -> Parameters:
+        with phase("parameters"):
+            return super()._get_parameters(parameters, operation, path)
+
+    def _get_body(
+        self, body: bytes | None, mimetype: str, operation: SchemaPath
+    ) -> t.Any:
+        with phase("body"):
+            return super()._get_body(body, mimetype, operation)
+
+    def _validate_schema(self, schema: SchemaPath, value: t.Any) -> None:
+        with phase("schema"):
+            super()._validate_schema(schema, value)
+
+
+class SchemaTimingMixin:
+    """Time validation against each schema into the active schema timings.
+
+    Only the top-level schemas openapi-core validates against are timed,
+    i.e. those of each parameter, header and body, not their subschemas.
+    """
+
+    def _validate_schema(self, schema: SchemaPath, value: t.Any) -> None:
+        with time_schema(schema):
+            super()._validate_schema(schema, value)
+
+
+class RenderedJSONMixin:
+    """Validate the object a JSON response was rendered from, if known.
+
+    This saves parsing the body that the `openapi_json` renderer produced.
+    """
+
+    def _deserialise_media_type(
+        self,
+        media_type: SchemaPath,
+        mimetype: str,
+        parameters: t.Mapping[str, str],
+        value: bytes | RenderedJSON,
+    ) -> t.Any:
+        if isinstance(value, RenderedJSON):
+            return value.value
+        return super()._deserialise_media_type(media_type, mimetype, parameters, value)
+
+
+class V30RequestUnmarshaller(
+    EmptyOperationsMixin,
+    SharedJSONBodyMixin,
+    StagedUnmarshalMixin,
+    TimedRequestPhasesMixin,
+    SchemaTimingMixin,
+    IndexedPathFinderMixin,
+    _V30RequestUnmarshaller,
+):
+    """OpenAPI 3.0 request unmarshaller using the route index."""
+
+
+class V31RequestUnmarshaller(
+    EmptyOperationsMixin,
+    SharedJSONBodyMixin,
+    StagedUnmarshalMixin,
+    TimedRequestPhasesMixin,
+    SchemaTimingMixin,
+    IndexedPathFinderMixin,
+    _V31RequestUnmarshaller,
+):
+    """OpenAPI 3.1 request unmarshaller using the route index."""
+
+
+class V32RequestUnmarshaller(
+    EmptyOperationsMixin,
+    SharedJSONBodyMixin,
+    StagedUnmarshalMixin,
+    TimedRequestPhasesMixin,
+    SchemaTimingMixin,
+    IndexedPathFinderMixin,
+    _V32RequestUnmarshaller,
+):
+    """OpenAPI 3.2 request unmarshaller using the route index."""
+
+
+class V30ResponseValidator(
+    RenderedJSONMixin,
+    SchemaTimingMixin,
+    IndexedPathFinderMixin,
+    _V30ResponseValidator,
+):
+    """OpenAPI 3.0 response validator using the route index."""
+
+
+class V31ResponseValidator(
+    RenderedJSONMixin,
+    SchemaTimingMixin,
+    IndexedPathFinderMixin,
+    _V31ResponseValidator,
+):
+    """OpenAPI 3.1 response validator using the route index."""
+
+
+class V32ResponseValidator(
+    RenderedJSONMixin,
+    SchemaTimingMixin,
+    IndexedPathFinderMixin,
+    _V32ResponseValidator,
+):
+    """OpenAPI 3.2 response validator using the route index."""
+
+
+class V30ResponseHeadersValidator(
+    SchemaTimingMixin, IndexedPathFinderMixin, _V30ResponseHeadersValidator
+):
+    """OpenAPI 3.0 response status/headers validator using the route index."""
+
+
+class V31ResponseHeadersValidator(
+    SchemaTimingMixin, IndexedPathFinderMixin, _V31ResponseHeadersValidator
+):
+    """OpenAPI 3.1 response status/headers validator using the route index."""
+
+
+class V32ResponseHeadersValidator(
+    SchemaTimingMixin, IndexedPathFinderMixin, _V32ResponseHeadersValidator
+):
+    """OpenAPI 3.2 response status/headers validator using the route index."""
@@ -1,25 +1,68 @@
 """Wrap Pyramid's Request and Response."""
 
+from dataclasses import dataclass
+from functools import cached_property
+from openapi_core.templating.paths.datatypes import PathOperationServer
 from openapi_core.validation.request.datatypes import RequestParameters
 from pyramid.request import Request
 from pyramid.response import Response
+from webob.headers import ResponseHeaders
 
 import typing as t
 
+# Marks that request validation has not deserialized a JSON body
+UNPARSED: t.Final = object()
 
-class PyramidOpenAPIRequest:
-    """Map Pyramid Request attributes to what openapi expects."""
+
+class PyramidRequestParameters(RequestParameters):
+    """Request parameters that are read from the Pyramid request on access.
+
+    Parsing the query string and the Cookie header only happens if the
+    operation declares query or cookie parameters (or security schemes).
+    `request.headers` is a view over the WSGI environ, so only the headers
+    that are looked up are ever read.
+    """
 
     def __init__(self, request: Request) -> None:
         self.request = request
+        self.path = request.matchdict  # ty: ignore[invalid-assignment]
+        self.header = request.headers
 
-        self.parameters = RequestParameters(
-            path=self.request.matchdict,  # ty: ignore[invalid-argument-type]
-            query=self.request.GET,
-            header=self.request.headers,
-            cookie=self.request.cookies,
+    @property
+    def query(self) -> t.Mapping[str, t.Any]:  # ty: ignore[invalid-property-type-override]
+        """Query string parameters."""
+        return self.request.GET
+
+    @property
+    def cookie(self) -> t.Mapping[str, t.Any]:  # ty: ignore[invalid-property-type-override]
+        """Request cookies."""
+        return self.request.cookies
+
+    def __eq__(self, other: object) -> bool:
+        """Compare equal to RequestParameters with the same values."""
+        if not isinstance(other, RequestParameters):
+            return NotImplemented
+        return (self.query, self.header, self.cookie, self.path) == (
+            other.query,
+            other.header,
+            other.cookie,
+            other.path,
         )
 
+    __hash__ = None
+
+
+class PyramidOpenAPIRequest:
+    """Map Pyramid Request attributes to what openapi expects."""
+
+    def __init__(self, request: Request) -> None:
+        self.request = request
+        self.parameters = PyramidRequestParameters(request)
+        # Resolved by the first validator, reused by the following ones
+        self.path_operation: PathOperationServer | None = None
+        # Set when request validation deserializes a JSON body
+        self.json_body: t.Any = UNPARSED
+
     @property
     def host_url(self) -> str:
         """Url with scheme and host. Example: https://localhost:8000."""
@@ -40,14 +83,20 @@ class PyramidOpenAPIRequest:
         )
         return self.request.script_name + path_pattern
 
+    @property
+    def route_name(self) -> str | None:
+        """The name of the matched route, if any."""
+        route = self.request.matched_route
+        return route.name if route else None
+
     @property
     def method(self) -> str:
         """The request method, as lowercase string."""
         return self.request.method.lower()
 
-    @property
+    @cached_property
     def body(self) -> bytes | str | dict | None:
-        """The request body."""
+        """The request body, read once."""
         return self.request.body
 
     @property
@@ -67,15 +116,41 @@ class PyramidOpenAPIRequest:
         return self.request.content_type
 
 
+def is_streaming_response(response: Response) -> bool:
+    """Return True if reading the response body would consume a stream.
+
+    Responses with a body set hold it as a list, whereas `FileResponse` and
+    responses with a generator `app_iter` produce it while being sent.
+    """
+    return not isinstance(response.app_iter, (list, tuple))
+
+
+@dataclass(frozen=True)
+class RenderedJSON:
+    """A JSON response body, with the object it was rendered from."""
+
+    body: bytes
+    value: t.Any
+
+
 class PyramidOpenAPIResponse:
-    """Map Pyramid Response attributes to what openapi expects."""
+    """Map Pyramid Response attributes to what openapi expects.
+
+    Pass the `rendered` JSON of the response to have its object validated
+    instead of parsing the body.
+    """
 
-    def __init__(self, response: Response) -> None:
+    def __init__(
+        self, response: Response, rendered: RenderedJSON | None = None
+    ) -> None:
         self.response = response
+        self.rendered = rendered
 
     @property
-    def data(self) -> bytes:
+    def data(self) -> bytes | RenderedJSON:
         """The response body."""
+        if self.rendered is not None:
+            return self.rendered
         return self.response.body
 
     @property
@@ -97,3 +172,63 @@ class PyramidOpenAPIResponse:
     def headers(self) -> t.Mapping[str, t.Any]:
         """The response headers."""
         return self.response.headers
+
+
+@dataclass(frozen=True)
+class OpenAPIRequestSnapshot:
+    """Copy of the request attributes that response validation needs.
+
+    Unlike PyramidOpenAPIRequest it holds no reference to the Pyramid
+    request, so it can be validated after the request has finished.
+    """
+
+    host_url: str
+    path: str
+    path_pattern: str
+    method: str
+    route_name: str | None
+    path_operation: PathOperationServer | None = None
+
+    @classmethod
+    def from_request(
+        cls, openapi_request: PyramidOpenAPIRequest
+    ) -> "OpenAPIRequestSnapshot":
+        """Take a snapshot of a PyramidOpenAPIRequest."""
+        return cls(
+            host_url=openapi_request.host_url,
+            path=openapi_request.path,
+            path_pattern=openapi_request.path_pattern,
+            method=openapi_request.method,
+            route_name=openapi_request.route_name,
+            path_operation=openapi_request.path_operation,
+        )
+
+
+@dataclass(frozen=True)
+class OpenAPIResponseSnapshot:
+    """Copy of the response attributes that response validation needs."""
+
+    data: bytes
+    status_code: int
+    content_type: str
+    headers: t.Mapping[str, t.Any]
+
+    @property
+    def mimetype(self) -> str:
+        """The content type of the response."""
+        return self.content_type
+
+    @classmethod
+    def from_response(
+        cls, response: Response, *, with_body: bool = True
+    ) -> "OpenAPIResponseSnapshot":
+        """Take a snapshot of a Pyramid response.
+
+        Pass `with_body=False` to leave the body of streaming responses unread.
+        """
+        return cls(
+            data=response.body if with_body else b"",
+            status_code=response.status_code,
+            content_type=response.content_type,
+            headers=ResponseHeaders(list(response.headerlist)),
+        )